@@ -15,6 +15,7 @@ from munch import Munch, munchify
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+from pueblo_goof.slack.directory import CHANNEL_TYPES, SlackChannelDirectory, list_channels
 from pueblo_goof.slack.model import SlackChannel, SlackMessage, SlackOptions
 
 logger = logging.getLogger(__name__)
@@ -40,18 +41,21 @@ class SlackConversation:
     def decode_channel(self, channel: str) -> str:
         """
         Decode channel id from channel id, name, or URL.
+
+        Channel names are resolved using a cached channel directory.
         """
         channel_search = SlackChannel.from_any(channel)
         try:
-            return self.find_channel(what=channel_search).id
-        except (AttributeError, KeyError, TypeError) as e:
+            return SlackChannelDirectory(self.webclient).resolve(channel_search)  # type: ignore[arg-type]
+        except (AttributeError, KeyError, TypeError, SlackApiError) as e:
             raise KeyError(f"Resolving channel failed: {channel_search}") from e
 
-    def channels(self, limit: int = 999) -> t.List[Munch]:
+    def channels(self, limit: int = 999, types: str = CHANNEL_TYPES) -> t.Iterator[Munch]:
         """
-        Enumerate all channels.
+        Enumerate channels, by default public and private ones, following pagination cursors.
         """
-        return munchify(self.webclient.conversations_list(limit=limit)["channels"])
+        for channel in list_channels(self.webclient, types=types, limit=limit):
+            yield munchify(channel)
 
     def find_channel(self, what: t.Optional[str] = None):
         """
@@ -63,34 +67,48 @@ class SlackConversation:
                 return channel
         raise KeyError(f"Unable to find channel: {what}")
 
-    def messages(self, limit: int = 20):
-        """
-        Enumerate all messages.
+    def messages(
+        self,
+        limit: int = 200,
+        oldest: t.Optional[str] = None,
+        latest: t.Optional[str] = None,
+    ) -> t.Iterator[Munch]:
         """
-        return munchify(
-            self.webclient.conversations_history(
-                channel=self.channel_id,
-                limit=limit,
-                inclusive=True,
-                include_all_metadata=True,
-            )["messages"]
-        )
+        Enumerate all messages, most recent first.
+
+        Pages of `limit` messages are fetched lazily, following pagination cursors,
+        so consumers can stop early. Use `oldest` and `latest` to constrain the time
+        range, using Slack message timestamps.
 
-    def replies(self, ts: str, limit: int = 20):
+        https://api.slack.com/methods/conversations.history
         """
-        Enumerate all replies.
+        for page in self.webclient.conversations_history(
+            channel=self.channel_id,
+            limit=limit,
+            oldest=oldest,
+            latest=latest,
+            inclusive=True,
+            include_all_metadata=True,
+        ):
+            yield from munchify(page["messages"])
+
+    def replies(self, ts: str, limit: int = 200) -> t.Iterator[Munch]:
+        """
+        Enumerate all replies, including the parent message.
+
+        Pages of `limit` messages are fetched lazily, following pagination cursors,
+        so consumers can stop early.
 
         https://api.slack.com/methods/conversations.replies
         """
-        return munchify(
-            self.webclient.conversations_replies(
-                channel=self.channel_id,
-                ts=ts,
-                limit=limit,
-                inclusive=True,
-                include_all_metadata=True,
-            )["messages"]
-        )
+        for page in self.webclient.conversations_replies(
+            channel=self.channel_id,
+            ts=ts,
+            limit=limit,
+            inclusive=True,
+            include_all_metadata=True,
+        ):
+            yield from munchify(page["messages"])
 
     def find_message_by_text(self, *labels):
         """
@@ -107,6 +125,8 @@ class SlackConversation:
         """
         Find message by metadata information.
 
+        When `messages` is a lazy iterator, it is consumed only until the first match.
+
         https://api.slack.com/reference/metadata
         """
         for message in messages:
@@ -0,0 +1,219 @@
+"""
+Resolve Slack channel names and user ids, using a persistent cache.
+
+https://api.slack.com/methods/conversations.list
+https://api.slack.com/methods/users.list
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+from pueblo_goof.util import cache_path
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_TYPES = "public_channel,private_channel"
+
+
+def list_channels(
+    webclient: WebClient, types: str = CHANNEL_TYPES, **kwargs
+) -> t.Iterator[t.Dict[str, t.Any]]:
+    """
+    Enumerate channels of the given types, following pagination cursors.
+
+    When the token is not permitted to list private channels, i.e. it lacks
+    the `groups:read` scope, fall back to enumerating public channels only.
+    """
+    try:
+        for page in webclient.conversations_list(types=types, **kwargs):
+            yield from page["channels"]
+    except SlackApiError as ex:
+        if ex.response["error"] != "missing_scope" or types == "public_channel":
+            raise
+        logger.warning(f"Unable to list channels of types '{types}', using public channels only")
+        yield from list_channels(webclient, types="public_channel", **kwargs)
+
+
+class SlackDirectory:
+    """
+    Common base class for mappings acquired from the Slack API, cached on disk.
+
+    Entries are stored per workspace, i.e. per API token, and expire after `ttl` seconds.
+    Entries added individually are stored when calling `close()`.
+    """
+
+    name: t.ClassVar[str]
+
+    def __init__(
+        self,
+        webclient: WebClient,
+        path: t.Optional[Path] = None,
+        ttl: float = 86400,
+        max_entries: int = 100_000,
+    ) -> None:
+        self.webclient = webclient
+        self.path = path or cache_path()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: t.Optional[t.Dict[str, t.Any]] = None
+        self.timestamp: float = 0
+        self.dirty = False
+        self.lock = threading.RLock()
+
+    @property
+    def file(self) -> Path:
+        workspace = hashlib.sha256((self.webclient.token or "").encode()).hexdigest()[:16]
+        return self.path / f"{self.name}-{workspace}.json"
+
+    def load(self) -> t.Dict[str, t.Any]:
+        """
+        Load entries from memory or disk, refreshing them when missing or expired.
+        """
+        with self.lock:
+            if self.entries is None:
+                try:
+                    data = json.loads(self.file.read_text())
+                    if time.time() - data["timestamp"] < self.ttl:
+                        self.entries = data["entries"]
+                        self.timestamp = data["timestamp"]
+                except (OSError, KeyError, TypeError, ValueError):
+                    pass
+            if self.entries is None:
+                self.refresh()
+            return t.cast(t.Dict[str, t.Any], self.entries)
+
+    def refresh(self) -> t.Dict[str, t.Any]:
+        """
+        Acquire all entries from the Slack API, and store them on disk.
+        """
+        with self.lock:
+            self.entries = self.fetch()
+            self.timestamp = time.time()
+            self.save()
+            return self.entries
+
+    def close(self) -> None:
+        """
+        Store entries on disk, when entries have been added since loading them.
+        """
+        with self.lock:
+            if self.dirty:
+                self.save()
+
+    def save(self) -> None:
+        """
+        Store entries on disk, discarding the oldest ones beyond `max_entries`.
+
+        Entries added individually do not extend the lifetime of the directory.
+        """
+        with self.lock:
+            if self.entries is not None and len(self.entries) > self.max_entries:
+                self.entries = dict(list(self.entries.items())[-self.max_entries :])
+            try:
+                self.file.parent.mkdir(parents=True, exist_ok=True)
+                self.file.write_text(
+                    json.dumps({"timestamp": self.timestamp, "entries": self.entries})
+                )
+            except OSError as ex:
+                logger.warning(f"Unable to store {self.name} directory: {ex}")
+            self.dirty = False
+
+    def fetch(self) -> t.Dict[str, t.Any]:
+        raise NotImplementedError("Needs to be implemented")
+
+
+class SlackChannelDirectory(SlackDirectory):
+    """
+    Resolve channel names to channel ids.
+
+    Channel ids are used verbatim, without inquiring the Slack API. On a
+    cache miss, the directory is refreshed once, for example to discover
+    channels created recently.
+    """
+
+    name = "channels"
+
+    ID_PATTERN: t.ClassVar[t.Pattern] = re.compile(r"^[CGD][A-Z0-9]{8,}$")
+
+    def __init__(self, webclient: WebClient, types: str = CHANNEL_TYPES, **kwargs) -> None:
+        super().__init__(webclient, **kwargs)
+        self.types = types
+
+    def resolve(self, channel: str) -> str:
+        if self.ID_PATTERN.match(channel):
+            return channel
+        channels = self.load()
+        if channel not in channels:
+            logger.info(f"Channel not found in directory, refreshing: {channel}")
+            channels = self.refresh()
+        if channel not in channels:
+            raise KeyError(f"Unable to find channel: {channel}")
+        return channels[channel]
+
+    def fetch(self) -> t.Dict[str, t.Any]:
+        """
+        Enumerate channels, by default public and private ones.
+        """
+        channels = {}
+        for channel in list_channels(
+            self.webclient, types=self.types, exclude_archived=True, limit=1000
+        ):
+            channels[channel["name"]] = channel["id"]
+        logger.info(f"Loaded {len(channels)} channels into directory")
+        return channels
+
+
+class SlackUserDirectory(SlackDirectory):
+    """
+    Resolve user ids to user names.
+
+    All users of the workspace are acquired in bulk. Users missing from the
+    directory, for example from other workspaces, are looked up individually,
+    and added to the directory, which is stored on disk when closing it.
+    """
+
+    name = "users"
+
+    def resolve(self, user_id: str) -> t.Optional[str]:
+        users = self.load()
+        if user_id in users:
+            return users[user_id]
+        try:
+            response = self.webclient.users_info(user=user_id)
+        except SlackApiError as ex:
+            logger.error(
+                f"Slack API error when resolving user ID {user_id}: {ex.response['error']}"
+            )
+            return None
+        if not response["ok"]:
+            logger.error(f"Failed to resolve user ID {user_id}: {response['error']}")
+            return None
+        with self.lock:
+            users[user_id] = response["user"]["name"]
+            self.dirty = True
+        return users[user_id]
+
+    def fetch(self) -> t.Dict[str, t.Any]:
+        """
+        Enumerate all users, following pagination cursors.
+
+        When the bulk operation is not permitted, start with an empty directory.
+        """
+        users = {}
+        try:
+            for page in self.webclient.users_list(limit=200):
+                for member in page["members"]:
+                    users[member["id"]] = member["name"]
+        except SlackApiError as ex:
+            logger.warning(f"Unable to enumerate users: {ex.response['error']}")
+        logger.info(f"Loaded {len(users)} users into directory")
+        return users
@@ -1,9 +1,23 @@
 import datetime as dt
+import os
 import sys
 import time
 import typing as t
+from pathlib import Path
 
-import dateparser
+
+def cache_path(envvar: str = "GOOF_CACHE_DIR", appname: str = "goof") -> Path:
+    """
+    Return the directory for cache files, by default the user cache directory.
+
+    Use the environment variable `envvar`, by default `GOOF_CACHE_DIR`, to override it.
+    """
+    path = os.getenv(envvar)
+    if path:
+        return Path(path)
+    import platformdirs
+
+    return platformdirs.user_cache_path(appname)
 
 
 class Zapper:
@@ -27,6 +41,8 @@ class Zapper:
 
     def _compute_delay(self) -> float:
         if self.is_stopclock:
+            import dateparser
+
             duration = dateparser.parse(self.when)
             if duration is None:
                 raise ValueError(f"Unable to parse duration: {duration}")
@@ -0,0 +1,70 @@
+import typing as t
+
+import click
+
+from rapporto.cache.core import HttpCache, parse_duration
+
+
+def validate_duration(ctx: click.Context, param: click.Parameter, value: t.Optional[str]):
+    if value is not None:
+        try:
+            return parse_duration(value)
+        except ValueError as ex:
+            raise click.BadParameter(str(ex)) from ex
+    return value
+
+
+@click.group()
+def cli():
+    """
+    Inspect and maintain the HTTP cache.
+    """
+    pass
+
+
+@cli.command()
+def stats():
+    """
+    Display size, entries per endpoint, and cache hits.
+    """
+    for key, value in HttpCache().stats().items():
+        if isinstance(value, dict):
+            click.echo(f"{key}:")
+            for name, count in value.items():
+                click.echo(f"  {name}: {count}")
+        else:
+            click.echo(f"{key}: {value}")
+
+
+@cli.command()
+@click.option(
+    "--older-than",
+    type=str,
+    required=False,
+    callback=validate_duration,
+    help="Only purge responses older than given duration, e.g. 12h, 7d",
+)
+@click.option("--expired", is_flag=True, required=False, help="Only purge expired responses")
+@click.option("--all", "all_", is_flag=True, required=False, help="Purge all responses")
+def purge(older_than=None, expired: bool = False, all_: bool = False):
+    """
+    Delete cached responses.
+
+    Use `--all` to delete all responses.
+    """
+    if older_than is None and not expired and not all_:
+        raise click.UsageError("Use `--older-than`, `--expired`, or `--all` to select responses.")
+    count = HttpCache().purge(older_than=older_than, expired=expired, everything=all_)
+    click.echo(f"Purged {count} responses")
+
+
+@cli.command()
+def vacuum():
+    """
+    Reclaim unused disk space.
+    """
+    try:
+        HttpCache().vacuum()
+    except NotImplementedError as ex:
+        click.echo(f"ERROR: {ex}", err=True)
+        raise SystemExit(2) from ex
@@ -0,0 +1,108 @@
+import datetime as dt
+import re
+import typing as t
+import urllib.parse
+from collections import Counter
+from pathlib import Path
+
+import requests_cache
+
+from rapporto.source.github.util import GitHubCacheStatistics, GitHubHttpOptions
+
+
+def parse_duration(value: str) -> dt.timedelta:
+    """
+    Parse durations like `30m`, `12h`, `7d`, or `2w`. Plain numbers are seconds.
+    """
+    units = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    match = re.fullmatch(r"\s*(\d+)\s*([smhdw]?)\s*", value)
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    amount, unit = match.groups()
+    return dt.timedelta(**{units[unit or "s"]: int(amount)})
+
+
+def endpoint(url: str) -> str:
+    """
+    Reduce a URL to its API endpoint, for grouping cache entries.
+
+    https://api.github.com/repos/acme/foo/pulls/42 => api.github.com/repos/*/*/pulls
+    """
+    uri = urllib.parse.urlparse(url)
+    parts = uri.path.strip("/").split("/")
+    if parts[0] == "repos":
+        parts = ["repos", "*", "*", *parts[3:4]]
+    else:
+        parts = parts[:2]
+    return "/".join([uri.netloc, *parts])
+
+
+class HttpCache:
+    """
+    Inspect and maintain the HTTP cache, without needing a session.
+    """
+
+    def __init__(self, options: t.Optional[GitHubHttpOptions] = None):
+        self.options = options or GitHubHttpOptions()
+        self.backend = requests_cache.init_backend(
+            cache_name=self.options.cache_location, backend=self.options.backend
+        )
+
+    @property
+    def path(self) -> t.Optional[Path]:
+        db_path = getattr(self.backend.responses, "db_path", None)
+        return db_path and Path(db_path)
+
+    @property
+    def size(self) -> int:
+        if self.path is None or not self.path.exists():
+            return 0
+        return self.path.stat().st_size
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        """
+        Report about size and contents of the cache, and about cumulative cache hits.
+        """
+        endpoints: t.Counter[str] = Counter()
+        expired = 0
+        for response in self.backend.filter(valid=True, expired=True):
+            endpoints[endpoint(response.url)] += 1
+            expired += response.is_expired
+        requests = GitHubCacheStatistics.load(self.options.statistics_path)
+        return {
+            "location": str(self.path or self.options.cache_location),
+            "size": self.size,
+            "responses": sum(endpoints.values()),
+            "expired": expired,
+            "requests": GitHubCacheStatistics.format(requests),
+            "endpoints": dict(endpoints.most_common()),
+        }
+
+    def purge(
+        self,
+        older_than: t.Optional[dt.timedelta] = None,
+        expired: bool = False,
+        everything: bool = False,
+    ) -> int:
+        """
+        Delete cached responses, returning their number.
+
+        Deleting all responses must be requested explicitly using `everything`.
+        """
+        if older_than is None and not expired and not everything:
+            raise ValueError("Refusing to purge the whole cache without constraints")
+        before = len(self.backend.responses)
+        if everything:
+            self.backend.clear()
+        else:
+            self.backend.delete(older_than=older_than, expired=expired)
+        return before - len(self.backend.responses)
+
+    def vacuum(self) -> None:
+        """
+        Reclaim unused disk space.
+        """
+        vacuum = getattr(self.backend.responses, "vacuum", None)
+        if vacuum is None:
+            raise NotImplementedError(f"Backend does not support vacuuming: {self.options.backend}")
+        vacuum()
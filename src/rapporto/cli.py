@@ -1,17 +1,9 @@
 import click
-from click_aliases import ClickAliasedGroup
 
-from rapporto.animate.cli import cli as animate_cli
-from rapporto.notify.cli import cli as notify_cli
-from rapporto.report.cli import cli as report_cli
-from rapporto.source.changes.cli import cli as changes_cli
-from rapporto.source.github.cli import cli as github_cli
-from rapporto.source.opsgenie.cli import cli as opsgenie_cli
-from rapporto.source.slack.cli import cli as slack_cli
-from rapporto.util import setup_logging
+from rapporto.util import LazyAliasedGroup, setup_logging
 
 
-@click.group(cls=ClickAliasedGroup)
+@click.group(cls=LazyAliasedGroup)
 @click.option("--verbose", is_flag=True, required=False, help="Turn on logging")
 @click.option("--debug", is_flag=True, required=False, help="Turn on logging with debug level")
 @click.version_option()
@@ -20,10 +12,12 @@ def cli(ctx: click.Context, verbose: bool, debug: bool):
     setup_logging(verbose=verbose)
 
 
-cli.add_command(github_cli, "github", aliases=["gh"])
-cli.add_command(opsgenie_cli, "opsgenie")
-cli.add_command(slack_cli, "slack")
-cli.add_command(notify_cli, "notify")
-cli.add_command(report_cli, "report")
-cli.add_command(animate_cli, "animate")
-cli.add_command(changes_cli, "changes")
+# Subsystems are imported on demand, to speed up program startup.
+cli.add_lazy_command("rapporto.source.github.cli:cli", "github", aliases=["gh"])
+cli.add_lazy_command("rapporto.source.opsgenie.cli:cli", "opsgenie")
+cli.add_lazy_command("rapporto.source.slack.cli:cli", "slack")
+cli.add_lazy_command("rapporto.notify.cli:cli", "notify")
+cli.add_lazy_command("rapporto.report.cli:cli", "report")
+cli.add_lazy_command("rapporto.animate.cli:cli", "animate")
+cli.add_lazy_command("rapporto.source.changes.cli:cli", "changes")
+cli.add_lazy_command("rapporto.cache.cli:cli", "cache")
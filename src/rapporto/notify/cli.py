@@ -6,9 +6,14 @@ from pueblo_goof.slack.conversation import SlackConversation
 from pueblo_goof.slack.model import SlackOptions, slack_api_token_option, slack_channel_option
 from pueblo_goof.util import Zapper
 from rapporto.notify.slack import SlackWeekly
-from rapporto.option import github_organization_option, github_repository_option
+from rapporto.option import (
+    github_http_options,
+    github_organization_option,
+    github_repository_option,
+)
 from rapporto.report.model import ReportOptions
 from rapporto.source.github.model import GitHubOptions
+from rapporto.source.github.util import GitHubHttpClient
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +21,7 @@ logger = logging.getLogger(__name__)
 @click.group()
 @github_organization_option
 @github_repository_option
+@github_http_options
 @slack_api_token_option
 @slack_channel_option
 @click.pass_context
@@ -38,19 +44,34 @@ def cli(
     )
     ctx.meta["slack_options"] = SlackOptions(token=slack_token, channel=slack_channel)
     ctx.meta["report_options"] = ReportOptions(output_format="markdown")
+    GitHubHttpClient.configure(**ctx.meta.get("github_http_options", {}))
+    ctx.call_on_close(GitHubHttpClient.report_statistics)
 
 
 @cli.command()
 @click.option("--week", type=str, required=False, help="Calendar week")
 @click.option("--zap", type=str, required=False, help="Zap message again")
+@click.option(
+    "--incremental/--no-incremental",
+    default=True,
+    help="Load past days from snapshots, only computing today and yesterday. Default: On",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    default=False,
+    help="Ignore snapshots, computing all days again, and renew the snapshots",
+)
 @click.pass_context
-def weekly(ctx: click.Context, week: str, zap: str):
+def weekly(ctx: click.Context, week: str, zap: str, incremental: bool, refresh: bool):
     """
     Weekly report converged into Slack thread.
     """
 
     github_options: GitHubOptions = ctx.meta["github_options"]
     report_options: ReportOptions = ctx.meta["report_options"]
+    report_options.incremental = incremental
+    report_options.refresh = refresh
     slack_options: SlackOptions = ctx.meta["slack_options"]
 
     conversation = SlackConversation(options=slack_options)
@@ -4,8 +4,10 @@ Use Slack conversations like a static documentation generator target.
 
 import dataclasses
 import datetime as dt
+import hashlib
 import logging
 import typing as t
+from functools import cached_property
 
 from pueblo_goof.slack.conversation import SlackConversation
 from rapporto import __version__
@@ -34,6 +36,9 @@ class SlackWeekly:
     # Message id of the root message.
     root_id: t.Optional[str] = dataclasses.field(default=None)
 
+    # Replies to the root message, indexed by their metadata `key`.
+    replies_index: t.Optional[t.Dict[str, t.Any]] = dataclasses.field(default=None, repr=False)
+
     def __post_init__(self):
         if self.week is None:
             self.week = dt.datetime.now().strftime("%YW%V")
@@ -50,20 +55,28 @@ class SlackWeekly:
         logger.info(f"Creating or updating conversation for calendar week: {self.week}")
 
         message = self.conversation.find_message_by_metadata(
-            self.conversation.messages(), type="root", week=self.week
+            self.conversation.messages(oldest=self.oldest), type="root", week=self.week
         )
         metadata = {
             "author": self.AUTHOR,
             "type": "root",
             "week": self.week,
+            "digest": self.digest(self.root_markdown),
         }
         if message:
             self.root_id = message["ts"]
             if self.root_id is None:
                 raise KeyError("Root message was not created")
-            self.conversation.update(
-                ts=self.root_id, markdown=self.root_markdown, metadata=metadata
-            )
+            self.replies_index = None
+            if self.is_unchanged(message, metadata["digest"]):
+                logger.info("Root message is unchanged")
+            else:
+                self.conversation.update(
+                    ts=self.root_id,
+                    markdown=self.root_markdown,
+                    event=self.ROOT_EVENT,
+                    metadata=metadata,
+                )
         else:
             # Submit the root message.
             response = self.conversation.send(
@@ -72,10 +85,42 @@ class SlackWeekly:
             self.root_id = response["ts"]
             if self.root_id is None:
                 raise KeyError("Root message was not created")
+            self.replies_index = {}
+
+        # Submit the preamble message, so it is the first reply. It is updated after rendering.
+        if f"preamble_{self.week}" not in self.replies:
+            self.update_preamble()
+
+    def update_preamble(self, items: t.Optional[t.List[DailyItem]] = None):
+        """
+        Create or update the preamble message.
 
-        # Submit or update the preamble message.
+        Its digest includes the digests of all items, so the preamble, including
+        its timestamp, is only updated when the content of any item changed.
+        """
+        digests = [self.digest(item.markdown) for item in items or []]
         preamble = DailyItem(type="preamble", day=self.week, markdown=self.preamble_markdown)
-        self.create_or_update_item(item=preamble, msg_type="preamble", event=self.PREAMBLE_EVENT)
+        self.create_or_update_item(
+            item=preamble,
+            msg_type="preamble",
+            event=self.PREAMBLE_EVENT,
+            digest=self.digest("\n".join([self.preamble_markdown_stable, *digests])),
+        )
+
+    @property
+    def oldest(self) -> t.Optional[str]:
+        """
+        The earliest timestamp to scan for the root message, one day before the calendar week.
+
+        The root message is created when reporting about the week the first time.
+        When reporting about a future week, there is no lower bound.
+        """
+        from aika import TimeIntervalParser
+
+        start = TimeIntervalParser().parse(self.week).start - dt.timedelta(days=1)
+        if start > dt.datetime.now():
+            return None
+        return f"{start.timestamp():.6f}"
 
     @property
     def root_markdown(self):
@@ -90,15 +135,28 @@ class SlackWeekly:
         The message body for the preamble message, in Markdown format.
         """
         timestamp = dt.datetime.now().replace(microsecond=0).isoformat()
-        conversation_link = (
-            self.root_id and f"[🔗]({self.conversation.get_permalink(self.root_id)})"
-        ) or ""
+        return self.render_preamble(timestamp=timestamp)
+
+    @property
+    def preamble_markdown_stable(self):
+        """
+        The message body for the preamble message, without timestamp, to detect changes.
+
+        The timestamp reflects the most recent change of any item.
+        """
+        return self.render_preamble(timestamp="")
+
+    @cached_property
+    def conversation_link(self) -> str:
+        return (self.root_id and f"[🔗]({self.conversation.get_permalink(self.root_id)})") or ""
+
+    def render_preamble(self, timestamp: str) -> str:
         changelog_link = "[🔗](https://rapporto.readthedocs.io/changes.html)"
         caveats_link = "[🔗](https://rapporto.readthedocs.io/project/caveats.html)"
         items = [
             f"**Week:** {self.week}",
             f"**Updated:** {timestamp}",
-            f"**Root message:** {self.root_id}  {conversation_link}",
+            f"**Root message:** {self.root_id}  {self.conversation_link}",
             f"**Producer:** Rapporto v{__version__}  {changelog_link}",
             f"**Caveats:** Use responsibly.  {caveats_link}",
         ]
@@ -111,16 +169,60 @@ class SlackWeekly:
             report_options=self.report_options,
         )
         weekly.process()
-        for daily_report in weekly.dailies:
-            for daily_item in daily_report.items:
-                self.create_or_update_item(daily_item)
+        items = [daily_item for daily_report in weekly.dailies for daily_item in daily_report.items]
+        for daily_item in items:
+            self.create_or_update_item(daily_item)
+        self.update_preamble(items)
+
+    @property
+    def replies(self) -> t.Dict[str, t.Any]:
+        """
+        Load replies to the root message once, indexed by their metadata `key`.
+
+        Only messages of the event types produced by this class are indexed,
+        so foreign messages using the same metadata key do not shadow them.
+        """
+        if self.root_id is None:
+            raise KeyError("Unable to load replies without root message")
+        if self.replies_index is None:
+            self.replies_index = {}
+            for message in self.conversation.replies(ts=self.root_id):
+                metadata = message.get("metadata", {})
+                if metadata.get("event_type") not in (self.PREAMBLE_EVENT, self.ITEM_EVENT):
+                    continue
+                key = metadata.get("event_payload", {}).get("key")
+                if key is not None:
+                    self.replies_index.setdefault(key, message)
+        return self.replies_index
+
+    @staticmethod
+    def digest(markdown: str) -> str:
+        """
+        Compute a digest of the message content, to detect changes.
+        """
+        return hashlib.sha256(markdown.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def is_unchanged(message, digest: str) -> bool:
+        """
+        Whether the digest stored in the message metadata matches the content digest.
+        """
+        return message.get("metadata", {}).get("event_payload", {}).get("digest") == digest
 
     def create_or_update_item(
-        self, item: DailyItem, msg_type: str = "item", event: str = ITEM_EVENT
+        self,
+        item: DailyItem,
+        msg_type: str = "item",
+        event: str = ITEM_EVENT,
+        digest: t.Optional[str] = None,
     ):
         """
         Create or update a Slack message representing a DailyItem.
 
+        Messages whose content did not change are not updated, using a digest
+        of the content stored within the message metadata. When `digest` is
+        given, it is used instead of computing it from the item content.
+
         TODO: Add timestamp fields to metadata, and also update them on Slack's `update` operations.
         TODO: Generalize to also use with conversation's `seed` operation.
         """
@@ -129,27 +231,40 @@ class SlackWeekly:
         if self.root_id is None:
             raise KeyError("Unable to create items without root message")
         logger.info(f"Creating or updating reply for key: {key}")
-        message = self.conversation.find_message_by_metadata(
-            self.conversation.replies(ts=self.root_id), type=msg_type, key=key
-        )
+        message = self.replies.get(key)
+        if message and (
+            message["metadata"].get("event_type") != event
+            or message["metadata"]["event_payload"].get("type") != msg_type
+        ):
+            message = None
         metadata = {
             "key": key,
             "type": msg_type,
             "author": self.AUTHOR,
             "week": self.week,
             "day": item.day,
+            "digest": digest or self.digest(item.markdown),
         }
         if message:
             message_id = message["ts"]
+            if self.is_unchanged(message, metadata["digest"]):
+                logger.info(f"Message is unchanged, skipping update for key: {key}")
+                return None
             logger.info(f"Updating message with key: {key}")
-            return self.conversation.update(
-                ts=message_id, markdown=item.markdown, metadata=metadata
+            response = self.conversation.update(
+                ts=message_id, markdown=item.markdown, event=event, metadata=metadata
             )
         else:
             logger.info(f"Sending message with key: {key}")
-            return self.conversation.send(
+            response = self.conversation.send(
                 markdown=item.markdown,
                 reply_to=self.root_id,
                 event=event,
                 metadata=metadata,
             )
+        if response:
+            self.replies[key] = {
+                "ts": response["ts"],
+                "metadata": {"event_type": event, "event_payload": metadata},
+            }
+        return response
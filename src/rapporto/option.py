@@ -1,3 +1,5 @@
+import typing as t
+
 import click
 
 github_organization_option = click.option(
@@ -19,3 +21,70 @@ format_option = click.option(
     help="Output format. Default: markdown",
 )
 when_option = click.option("--when", type=str, required=False, help="Point in time")
+
+
+def collect_github_http_option(ctx: click.Context, param: click.Parameter, value: t.Any):
+    """
+    Collect options for HTTP sessions to the GitHub API, see `GitHubHttpOptions`.
+    """
+    if value is not None:
+        ctx.meta.setdefault("github_http_options", {})[param.name] = value
+    return value
+
+
+github_token_option = click.option(
+    "--github-token",
+    "token",
+    type=str,
+    envvar="GH_TOKEN",
+    required=False,
+    expose_value=False,
+    callback=collect_github_http_option,
+    help="GitHub API token",
+)
+github_cache_expire_option = click.option(
+    "--cache-expire",
+    "expire_after",
+    type=click.IntRange(min=0),
+    envvar="RAPPORTO_CACHE_EXPIRE",
+    required=False,
+    expose_value=False,
+    callback=collect_github_http_option,
+    help="Default expiration time of cached HTTP responses in seconds. Default: 3600",
+)
+github_cache_revalidate_option = click.option(
+    "--cache-revalidate",
+    "revalidate",
+    is_flag=True,
+    envvar="RAPPORTO_CACHE_REVALIDATE",
+    required=False,
+    default=None,
+    expose_value=False,
+    callback=collect_github_http_option,
+    help="Always revalidate cached HTTP responses using conditional requests",
+)
+github_pool_size_option = click.option(
+    "--http-pool-size",
+    "pool_maxsize",
+    type=click.IntRange(min=1),
+    required=False,
+    expose_value=False,
+    callback=collect_github_http_option,
+    help="Number of keep-alive HTTP connections to the GitHub API. Default: 16",
+)
+
+
+def github_http_options(func: t.Callable) -> t.Callable:
+    """
+    Add options for HTTP sessions to the GitHub API.
+
+    Use `GitHubHttpClient.configure(**ctx.meta.get("github_http_options", {}))` to apply them.
+    """
+    for option in [
+        github_pool_size_option,
+        github_cache_revalidate_option,
+        github_cache_expire_option,
+        github_token_option,
+    ]:
+        func = option(func)
+    return func
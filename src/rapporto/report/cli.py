@@ -4,11 +4,13 @@ import click
 
 from rapporto.option import (
     format_option,
+    github_http_options,
     github_organization_option,
     github_repository_option,
 )
 from rapporto.report.model import DailyReport, ReportOptions, WeeklyReport
 from rapporto.source.github.model import GitHubOptions
+from rapporto.source.github.util import GitHubHttpClient
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,7 @@ logger = logging.getLogger(__name__)
 @click.group()
 @github_organization_option
 @github_repository_option
+@github_http_options
 @format_option
 @click.pass_context
 def cli(ctx: click.Context, github_organization: str, github_repository: str, format_: str):
@@ -26,6 +29,8 @@ def cli(ctx: click.Context, github_organization: str, github_repository: str, fo
         github_repository
     )
     ctx.meta["report_options"] = ReportOptions(output_format=format_)
+    GitHubHttpClient.configure(**ctx.meta.get("github_http_options", {}))
+    ctx.call_on_close(GitHubHttpClient.report_statistics)
 
 
 @cli.command()
@@ -46,11 +51,24 @@ def daily(ctx: click.Context, day: str):
 
 @cli.command()
 @click.option("--week", type=str, required=False, help="Calendar week in ISO format, e.g. 2025W03")
+@click.option(
+    "--incremental/--no-incremental",
+    default=False,
+    help="Load past days from snapshots, only computing today and yesterday. Default: Off",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    default=False,
+    help="Ignore snapshots, computing all days again, and renew the snapshots",
+)
 @click.pass_context
-def weekly(ctx: click.Context, week: str):
+def weekly(ctx: click.Context, week: str, incremental: bool, refresh: bool):
     """
     Weekly report.
     """
+    ctx.meta["report_options"].incremental = incremental
+    ctx.meta["report_options"].refresh = refresh
     report = WeeklyReport(
         week=week,
         github_options=ctx.meta["github_options"],
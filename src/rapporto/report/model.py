@@ -1,26 +1,38 @@
 import datetime as dt
+import hashlib
 import io
+import json
+import logging
+import time
 import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 
 import attr
 import yaml
 from attrs import define
 
-from rapporto.source.github.actions import GitHubActionsReport
+from rapporto.source.github.actions import ActionsOutcome, GitHubActionsReport, GitHubActionsRequest
 from rapporto.source.github.attention import GitHubAttentionReport
 from rapporto.source.github.model import GitHubInquiry, GitHubMultiRepositoryInquiry, GitHubOptions
-from rapporto.util import week_to_day_range
+from rapporto.util import cache_path, week_to_day_range
+
+logger = logging.getLogger(__name__)
 
 
 @define
 class DailyItem:
     """
     Represent a single item of daily recurring report information.
+
+    Items not reflecting complete information, for example because fetching it
+    failed, are flagged using `complete`.
     """
 
     type: str
     day: str
     markdown: str
+    complete: bool = True
 
 
 @define
@@ -41,6 +53,135 @@ class ReportOptions:
     """
 
     output_format: str = "markdown"
+    incremental: bool = False
+    refresh: bool = False
+
+
+T = t.TypeVar("T")
+
+
+@define
+class SnapshotStore:
+    """
+    Persist items of past days on disk, to avoid computing them again.
+
+    Items are keyed by type, day, and a fingerprint of the query options. Only
+    days before the `recompute_days` most recent days are considered immutable,
+    i.e. by default, today and yesterday are computed again, so yesterday is
+    computed at least once after it ended. Snapshots are only saved for immutable
+    days, so they do not capture intermediary states of a day, and only for
+    complete items, so failures are not persisted.
+
+    Information about past days may still change, for example when issues are
+    closed. Snapshots expire after `ttl` seconds, and `refresh` ignores them,
+    so they are computed again, and renewed.
+    """
+
+    fingerprint: str
+    path: Path = attr.field(factory=lambda: cache_path() / "snapshots")
+    recompute_days: int = 2
+    ttl: t.Optional[float] = 86400
+    refresh: bool = False
+
+    @classmethod
+    def for_options(cls, github_options: GitHubOptions, **kwargs) -> "SnapshotStore":
+        """
+        Derive the fingerprint from the query options.
+        """
+        from rapporto import __version__
+
+        query = {
+            "organization": github_options.organization,
+            "repositories": sorted(github_options.repositories),
+            "version": __version__,
+        }
+        digest = hashlib.sha256(json.dumps(query, sort_keys=True).encode()).hexdigest()
+        return cls(fingerprint=digest[:16], **kwargs)
+
+    def is_immutable(self, day: str) -> bool:
+        earliest = dt.date.today() - dt.timedelta(days=self.recompute_days - 1)
+        return dt.date.fromisoformat(day) < earliest
+
+    def file(self, type_: str, day: str) -> Path:
+        return self.path / self.fingerprint / f"{day}_{type_}.json"
+
+    def is_expired(self, path: Path) -> bool:
+        return self.ttl is not None and time.time() - path.stat().st_mtime > self.ttl
+
+    def load(self, type_: str, day: str) -> t.Optional["DailyItem"]:
+        if self.refresh or not self.is_immutable(day):
+            return None
+        path = self.file(type_, day)
+        try:
+            if self.is_expired(path):
+                return None
+            return DailyItem(**json.loads(path.read_text()))
+        except (OSError, TypeError, ValueError):
+            return None
+
+    def save(self, item: "DailyItem") -> None:
+        if not self.is_immutable(item.day) or not item.complete:
+            return
+        path = self.file(item.type, item.day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(attr.asdict(item)))
+
+
+@define
+class GitHubHarvest:
+    """
+    Information from GitHub, fetched once for a whole range of days, and partitioned by day.
+
+    Workflow runs are partitioned by their creation time, like the GitHub API
+    filters them, so re-runs stay on the day they were created. Items deserving
+    attention by their time of last update. Each source is fetched separately,
+    recording its error when fetching it failed, without affecting the others.
+    """
+
+    actions_runs: t.Dict[str, t.List[ActionsOutcome]] = attr.field(factory=dict)
+    attention_items: t.Dict[str, t.List[t.Dict[str, t.Any]]] = attr.field(factory=dict)
+    actions_incomplete: t.List[str] = attr.field(factory=list)
+    attention_incomplete: t.List[str] = attr.field(factory=list)
+    actions_error: t.Optional[str] = None
+    attention_error: t.Optional[str] = None
+
+    @classmethod
+    def fetch(cls, github_options: GitHubOptions, days: t.List[str]) -> "GitHubHarvest":
+        timerange = f"{days[0]}..{days[-1]}"
+        harvest = cls()
+        request = GitHubActionsRequest(
+            GitHubMultiRepositoryInquiry(
+                repositories=github_options.repositories, created=timerange
+            )
+        )
+        try:
+            harvest.actions_runs = cls.partition(request.runs, lambda run: run.created[:10])
+            harvest.actions_incomplete = request.incomplete
+        except Exception as ex:
+            logger.exception(f"Fetching workflow runs for {timerange} failed: {ex}")
+            harvest.actions_error = str(ex)
+        report = GitHubAttentionReport(
+            GitHubInquiry(organization=github_options.organization, updated=timerange)
+        )
+        try:
+            harvest.attention_items = cls.partition(
+                report.items, lambda item: item["updated_at"][:10]
+            )
+            harvest.attention_incomplete = report.incomplete
+        except Exception as ex:
+            logger.exception(f"Fetching items deserving attention for {timerange} failed: {ex}")
+            harvest.attention_error = str(ex)
+        return harvest
+
+    @staticmethod
+    def partition(items: t.Iterable[T], day: t.Callable[[T], str]) -> t.Dict[str, t.List[T]]:
+        """
+        Group items by day, in `YYYY-MM-DD` format.
+        """
+        partitions: t.Dict[str, t.List[T]] = {}
+        for item in items:
+            partitions.setdefault(day(item), []).append(item)
+        return partitions
 
 
 @define
@@ -96,6 +237,12 @@ class DailyReport(ReportBase):
     report_options: ReportOptions
     items: t.List[DailyItem] = attr.field(factory=list)
 
+    # Methods generating report sections, each returning a `DailyItem` of given type.
+    sections: t.ClassVar[t.Dict[str, str]] = {
+        "github-actions": "github_actions",
+        "github-attention": "github_attention",
+    }
+
     def __attrs_post_init__(self):
         """
         Use current datetime by default.
@@ -103,35 +250,103 @@ class DailyReport(ReportBase):
         if self.day is None:
             self.day = dt.datetime.now().strftime("%Y-%m-%d")
 
-    def process(self):
+    def process(
+        self,
+        harvest: t.Optional[GitHubHarvest] = None,
+        snapshots: t.Optional[SnapshotStore] = None,
+    ):
         """
         Generate set of reports across different domains or topics.
+
+        Sections are generated concurrently. Their items are collected in the order
+        of `sections`. A failing section is logged, and represented by a placeholder
+        item, without affecting the others. When a harvest is given, sections use its
+        prefetched information instead of inquiring GitHub. When a snapshot store is
+        given, items of past days are loaded from it, or saved to it after generating
+        them.
         """
-        self.github_actions()
-        self.github_attention()
+        if snapshots is None and self.report_options.incremental:
+            snapshots = SnapshotStore.for_options(
+                self.github_options, refresh=self.report_options.refresh
+            )
+        results: t.List[t.Tuple[str, t.Union[DailyItem, Future]]] = []
+        with ThreadPoolExecutor(max_workers=len(self.sections)) as executor:
+            for type_, section in self.sections.items():
+                snapshot = snapshots and snapshots.load(type_, self.day)
+                if snapshot:
+                    results.append((type_, snapshot))
+                else:
+                    results.append((type_, executor.submit(getattr(self, section), harvest)))
+            for type_, result in results:
+                if isinstance(result, DailyItem):
+                    self.items.append(result)
+                    continue
+                try:
+                    item = result.result()
+                except Exception as ex:
+                    logger.exception(f"Generating section {type_} for {self.day} failed: {ex}")
+                    item = self.unavailable(type_, str(ex))
+                self.items.append(item)
+                if snapshots:
+                    snapshots.save(item)
+
+    def unavailable(self, type_: str, reason: str) -> DailyItem:
+        """
+        A placeholder item for a section which failed, flagged as incomplete.
+        """
+        return DailyItem(
+            type=type_,
+            day=self.day,
+            markdown=f"_Section {type_} unavailable: {reason}_",
+            complete=False,
+        )
+
+    def is_complete(self, snapshots: SnapshotStore) -> bool:
+        """
+        Whether all sections of this day are available from the snapshot store.
+        """
+        return all(snapshots.load(type_, self.day) for type_ in self.sections)
 
-    def github_actions(self):
+    def github_actions(self, harvest: t.Optional[GitHubHarvest] = None) -> DailyItem:
         """
         CI workflow run failures on GitHub.
         """
+        if harvest and harvest.actions_error:
+            return self.unavailable("github-actions", harvest.actions_error)
         # TODO: Use `TimeIntervalParser`.
         created = f"{self.day}..{self.day}"
         inquiry = GitHubMultiRepositoryInquiry(
             repositories=self.github_options.repositories, created=created
         )
-        report = GitHubActionsReport(inquiry=inquiry)
-        self.items.append(DailyItem(type="github-actions", day=self.day, markdown=report.markdown))
+        runs = harvest.actions_runs.get(self.day, []) if harvest else None
+        incomplete = harvest.actions_incomplete if harvest else None
+        report = GitHubActionsReport(inquiry=inquiry, runs=runs, incomplete=incomplete)
+        markdown = report.markdown
+        return DailyItem(
+            type="github-actions",
+            day=self.day,
+            markdown=markdown,
+            complete=not report.incomplete,
+        )
 
-    def github_attention(self):
+    def github_attention(self, harvest: t.Optional[GitHubHarvest] = None) -> DailyItem:
         """
         Items on GitHub that deserve your attention.
         """
+        if harvest and harvest.attention_error:
+            return self.unavailable("github-attention", harvest.attention_error)
         # TODO: Use `TimeIntervalParser`.
         updated = f"{self.day}..{self.day}"
         inquiry = GitHubInquiry(organization=self.github_options.organization, updated=updated)
-        report = GitHubAttentionReport(inquiry=inquiry)
-        self.items.append(
-            DailyItem(type="github-attention", day=self.day, markdown=report.markdown)
+        items = harvest.attention_items.get(self.day, []) if harvest else None
+        incomplete = harvest.attention_incomplete if harvest else None
+        report = GitHubAttentionReport(inquiry=inquiry, items=items, incomplete=incomplete)
+        markdown = report.markdown
+        return DailyItem(
+            type="github-attention",
+            day=self.day,
+            markdown=markdown,
+            complete=not report.incomplete,
         )
 
     def to_dict(self):
@@ -173,13 +388,29 @@ class WeeklyReport(ReportBase):
     def process(self):
         """
         Create all daily reports.
+
+        Information is fetched once for the whole week, and partitioned into days.
+        In incremental mode, only days not available from the snapshot store are
+        fetched and computed.
         """
-        for day in self.days:
-            report = DailyReport(
+        snapshots = None
+        if self.report_options.incremental:
+            snapshots = SnapshotStore.for_options(
+                self.github_options, refresh=self.report_options.refresh
+            )
+        dailies = [
+            DailyReport(
                 day=day, github_options=self.github_options, report_options=self.report_options
             )
-            report.process()
-            self.dailies.append(report)
+            for day in self.days
+        ]
+        pending = [
+            daily.day for daily in dailies if snapshots is None or not daily.is_complete(snapshots)
+        ]
+        harvest = GitHubHarvest.fetch(self.github_options, pending) if pending else None
+        for daily in dailies:
+            daily.process(harvest=harvest, snapshots=snapshots)
+            self.dailies.append(daily)
 
     def to_dict(self):
         return {
@@ -2,6 +2,8 @@ import dataclasses
 import logging
 import typing as t
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial
 
 from aika import TimeInterval
 from munch import Munch, munchify
@@ -10,9 +12,10 @@ from tqdm import tqdm
 from rapporto.source.github.model import (
     GitHubMultiRepositoryInquiry,
     MarkdownContent,
+    incomplete_notice,
     timeinterval,
 )
-from rapporto.source.github.util import GitHubHttpClient
+from rapporto.source.github.util import GitHubHttpClient, GitHubRateLimitExceeded, paginate
 from rapporto.util import sanitize_title
 
 logger = logging.getLogger(__name__)
@@ -21,13 +24,26 @@ logger = logging.getLogger(__name__)
 class GitHubActionsReport:
     """
     Report about failed outcomes of GitHub Actions workflow runs.
+
+    When `runs` are given, for example prefetched for a wider time range,
+    they are used instead of inquiring the GitHub API. Reasons why they are
+    incomplete can be given using `incomplete`.
     """
 
-    def __init__(self, inquiry: GitHubMultiRepositoryInquiry):
+    def __init__(
+        self,
+        inquiry: GitHubMultiRepositoryInquiry,
+        runs: t.Optional[t.List["ActionsOutcome"]] = None,
+        incomplete: t.Optional[t.List[str]] = None,
+    ):
         self.inquiry = inquiry
         self.request = GitHubActionsRequest(inquiry)
+        if runs is not None:
+            self.request.runs = runs
+        self.request.incomplete += incomplete or []
         self.runs_failed = self.request.runs_failed
         self.runs_pr_success = self.request.runs_pr_success
+        self.pr_success_index = self.index_runs(self.runs_pr_success)
 
     @property
     def runs(self):
@@ -37,29 +53,41 @@ class GitHubActionsReport:
         seen = set()
         for run in self.runs_failed:
             # Filter duplicates.
-            key = f"{run.repository.full_name}-{run.head_branch}-{run.name}"
-            if key in seen:
+            if run.key in seen:
                 continue
 
             # Filter PRs that subsequently succeeded.
             if run.event == "pull_request" and self.is_pr_successful(run):
                 continue
 
-            seen.add(key)
+            seen.add(run.key)
             yield run
 
+    @staticmethod
+    def index_runs(runs: t.Iterable["ActionsOutcome"]) -> t.Dict[t.Tuple[str, str, str], str]:
+        """
+        Map each run key to the start time of its most recent run.
+        """
+        index: t.Dict[t.Tuple[str, str, str], str] = {}
+        for run in runs:
+            started = run.started or ""
+            if run.key not in index or started > index[run.key]:
+                index[run.key] = started
+        return index
+
     def is_pr_successful(self, run):
         """
         Find out if a given run has others that succeeded afterward.
         """
-        for pr_run in self.runs_pr_success:
-            if (
-                run.repository.full_name == pr_run.repository.full_name
-                and run.head_branch == pr_run.head_branch
-                and run.name == pr_run.name
-            ):
-                return True
-        return False
+        started = self.pr_success_index.get(run.key)
+        return started is not None and started >= (run.started or "")
+
+    @property
+    def incomplete(self) -> t.List[str]:
+        """
+        Reasons why the report is incomplete.
+        """
+        return self.request.incomplete
 
     @property
     def markdown(self):
@@ -70,7 +98,7 @@ class GitHubActionsReport:
 # CI failures report {self.request.timeinterval.start.date().isoformat()}
 
 A report about GitHub Actions workflow runs that failed recently.
-Time range: {self.request.timeinterval.githubformat() or "n/a"}
+Time range: {self.request.timeinterval.githubformat() or "n/a"}{incomplete_notice(self.incomplete)}
 {mdc.render()}
         """.strip()
 
@@ -91,17 +119,20 @@ class GitHubActionsRequest:
 
     def __init__(self, inquiry: GitHubMultiRepositoryInquiry):
         self.inquiry = inquiry
-        self.session = GitHubHttpClient.session
+        self.session = GitHubHttpClient.get_session()
+        # Reasons why results are incomplete, e.g. an exhausted rate limit.
+        self.incomplete: t.List[str] = []
 
     @property
     def timeinterval(self) -> TimeInterval:
         """
-        Return same-day time interval.
+        Return same-day time interval, unless an explicit range `start..end` is given.
 
         TODO: Expand to use other, more broad time intervals sensibly.
         """
         ti = timeinterval(self.inquiry.created)
-        ti.end = ti.start
+        if not self.inquiry.created or ".." not in self.inquiry.created:
+            ti.end = ti.start
         return ti
 
     @property
@@ -114,43 +145,99 @@ class GitHubActionsRequest:
         # TODO: What about `dt.timedelta(hours=self.DELTA_HOURS)`, with `DELTA_HOURS = 24`?
         return self.timeinterval.githubformat()
 
-    def fetch(self, filter: "ActionsFilter") -> t.List["ActionsOutcome"]:  # noqa:A002
-        outcomes = []
-        for repository in tqdm(
-            self.inquiry.repositories,
-            desc=f"Fetching failed GitHub Actions outcomes for event={filter.event}",
+    def fetch(self, filter: "ActionsFilter") -> t.Iterator["ActionsOutcome"]:  # noqa:A002
+        """
+        Fetch outcomes from all repositories, using a bounded pool of concurrent workers.
+
+        The order of the outcomes follows the order of the repositories, independently
+        of the order in which responses arrive. Without concurrency, outcomes are
+        streamed page by page.
+        """
+        progress = partial(
+            tqdm,
+            total=len(self.inquiry.repositories),
+            desc="Fetching GitHub Actions outcomes",
             leave=False,
-        ):
-            url = f"https://api.github.com/repos/{repository}/actions/runs?{filter.query}"
-            logger.debug(f"Using API URL: {url}")
-            response = self.session.get(url)
-            if response.status_code == 404:
-                continue
-            response.raise_for_status()
-            for run in munchify(response.json()).workflow_runs:
-                outcome = ActionsOutcome(
-                    id=run.id,
-                    event=run.event,
-                    status=run.status,
-                    conclusion=run.conclusion,
-                    repository=run.repository,
-                    name=run.display_title,
-                    url=run.html_url,
-                    started=run.run_started_at,
-                    head_branch=run.head_branch,
-                )
-                outcomes.append(outcome)
-        return outcomes
+        )
+        if self.inquiry.concurrency <= 1:
+            for repository in progress(self.inquiry.repositories):
+                yield from self.iter_repository(filter, repository)
+            return
+        with ThreadPoolExecutor(max_workers=self.inquiry.concurrency) as executor:
+            results = executor.map(
+                partial(self.fetch_repository, filter), self.inquiry.repositories
+            )
+            for repository_outcomes in progress(results):
+                yield from repository_outcomes
+
+    def fetch_repository(
+        self,
+        filter: "ActionsFilter",  # noqa:A002
+        repository: str,
+    ) -> t.List["ActionsOutcome"]:
+        """
+        Fetch all outcomes from a single repository.
+        """
+        return list(self.iter_repository(filter, repository))
+
+    def iter_repository(
+        self,
+        filter: "ActionsFilter",  # noqa:A002
+        repository: str,
+    ) -> t.Iterator["ActionsOutcome"]:
+        """
+        Fetch outcomes from a single repository, following pagination links.
+
+        Skip repositories that do not exist. Stop early when reaching runs that have
+        been created before the designated time interval, because the API returns
+        the most recent runs first, or when the rate limit is exhausted.
+        """
+        url = f"https://api.github.com/repos/{repository}/actions/runs?{filter.query}"
+        logger.debug(f"Using API URL: {url}")
+        earliest = filter.created_start
+        try:
+            for response in paginate(self.session, url):
+                if response.status_code == 404:
+                    return
+                response.raise_for_status()
+                for run in munchify(response.json()).workflow_runs:
+                    if earliest and run.created_at[:10] < earliest:
+                        return
+                    yield ActionsOutcome(
+                        id=run.id,
+                        event=run.event,
+                        status=run.status,
+                        conclusion=run.conclusion,
+                        repository=run.repository,
+                        name=run.display_title,
+                        url=run.html_url,
+                        started=run.run_started_at,
+                        head_branch=run.head_branch,
+                        created=run.created_at,
+                    )
+        except GitHubRateLimitExceeded as ex:
+            logger.warning(f"Workflow runs of {repository} are incomplete: {ex}")
+            self.incomplete.append(f"Workflow runs of {repository} are incomplete: {ex}")
+
+    @cached_property
+    def runs(self) -> t.List["ActionsOutcome"]:
+        """
+        All workflow runs within the time interval, fetched using a single pass.
+
+        Filtering by event and conclusion happens on the client side, so each
+        repository is inquired only once per time interval.
+        """
+        return list(self.fetch(filter=ActionsFilter(created=self.created, per_page=100)))
 
     @property
     def runs_failed(self):
-        return self.fetch(filter=ActionsFilter(status="failure", created=self.created))
+        run_filter = ActionsFilter(status="failure")
+        return [run for run in self.runs if run_filter.matches(run)]
 
     @property
     def runs_pr_success(self):
-        return self.fetch(
-            filter=ActionsFilter(event="pull_request", status="success", created=self.created)
-        )
+        run_filter = ActionsFilter(event="pull_request", status="success")
+        return [run for run in self.runs if run_filter.matches(run)]
 
 
 @dataclasses.dataclass
@@ -158,6 +245,7 @@ class ActionsFilter:
     event: t.Optional[str] = None
     status: t.Optional[str] = None
     created: t.Optional[str] = None
+    per_page: t.Optional[int] = None
 
     @property
     def query(self) -> str:
@@ -168,8 +256,31 @@ class ActionsFilter:
             expression.append(f"status={self.status}")
         if self.created:
             expression.append(f"created={self.created}")
+        if self.per_page:
+            expression.append(f"per_page={self.per_page}")
         return "&".join(expression)
 
+    @property
+    def created_start(self) -> t.Optional[str]:
+        """
+        The lower bound of the `created` constraint, in `YYYY-MM-DD` format.
+        """
+        if not self.created:
+            return None
+        return self.created.split("..")[0].lstrip("<>=")[:10] or None
+
+    def matches(self, outcome: "ActionsOutcome") -> bool:
+        """
+        Apply the filter on the client side.
+
+        Like the GitHub API, `status` matches either the status or the conclusion of a run.
+        """
+        if self.event and outcome.event != self.event:
+            return False
+        if self.status and self.status not in (outcome.status, outcome.conclusion):
+            return False
+        return True
+
 
 @dataclasses.dataclass
 class ActionsOutcome:
@@ -182,6 +293,14 @@ class ActionsOutcome:
     url: str
     started: str
     head_branch: str
+    created: str = ""
+
+    @property
+    def key(self) -> t.Tuple[str, str, str]:
+        """
+        Identify runs of the same workflow on the same branch.
+        """
+        return self.repository.full_name, self.head_branch, self.name
 
     @property
     def markdown(self):
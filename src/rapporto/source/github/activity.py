@@ -1,19 +1,28 @@
 import dataclasses
+import heapq
 import logging
 import typing as t
 from abc import abstractmethod
+from fractions import Fraction
 from operator import attrgetter
 from textwrap import dedent
 
+import attr
 from attrs import define
 from dataclasses_json import CatchAll, Undefined, dataclass_json
 from requests import Session
-from tqdm import tqdm
 
+from rapporto.source.github.hydrate import (
+    GitHubGraphQLHydrator,
+    GitHubHydrationError,
+    GitHubRestHydrator,
+)
 from rapporto.source.github.model import (
     GitHubInquiry,
     GitHubQueryBuilder,
     GitHubSearch,
+    QKind,
+    incomplete_notice,
 )
 from rapporto.source.github.util import GitHubHttpClient, repository_name
 from rapporto.util import sanitize_title
@@ -37,9 +46,10 @@ class GitHubActivityReport:
     Report about activity across a whole GitHub organization.
     """
 
-    def __init__(self, inquiry: GitHubInquiry):
+    def __init__(self, inquiry: GitHubInquiry, share: t.Optional[str] = None):
         self.inquiry = inquiry
-        self.session = GitHubHttpClient.session
+        self.share = share
+        self.session = GitHubHttpClient.get_session()
         self.search = GitHubSearch.with_query_builder(
             self.session, GitHubActivityQueryBuilder(inquiry=inquiry)
         )
@@ -66,13 +76,20 @@ class GitHubActivityReport:
         *Problems:* n/a
         """).strip()
 
+    @property
+    def significant_options(self) -> t.Dict[str, t.Any]:
+        options: t.Dict[str, t.Any] = {"session": self.session, "search": self.search}
+        if self.share is not None:
+            options["share"] = self.share
+        return options
+
     @property
     def markdown_significant_issues(self):
-        return GitHubSignificantIssues(session=self.session, search=self.search).markdown
+        return GitHubSignificantIssues(**self.significant_options).markdown
 
     @property
     def markdown_significant_prs(self):
-        return GitHubSignificantPullRequests(session=self.session, search=self.search).markdown
+        return GitHubSignificantPullRequests(**self.significant_options).markdown
 
     @staticmethod
     def format_pr(item: "PullRequestMetadata"):
@@ -83,16 +100,19 @@ class GitHubActivityReport:
     @property
     def markdown(self) -> str:
         timerange = (self.inquiry.updated and f"for {self.inquiry.updated}") or ""
+        overview = self.markdown_overview
+        issues = self.markdown_significant_issues
+        prs = self.markdown_significant_prs
         return f"""
-# Activity report {timerange}
+# Activity report {timerange}{incomplete_notice(self.search.incomplete)}
 
-{self.markdown_overview}
+{overview}
 
 ## Top issues
-{self.markdown_significant_issues}
+{issues}
 
 ## Top changes
-{self.markdown_significant_prs}
+{prs}
 """.strip()
 
 
@@ -175,6 +195,18 @@ class PullRequestMetadata:
         return f"  - [{self.repo_name}: {sanitize_title(self.title)}]({self.html_url})"
 
 
+def to_fraction(value: t.Union[str, float, Fraction]) -> Fraction:
+    """
+    Convert share values like `2/5`, `0.4`, or `Fraction(2, 5)`.
+
+    Shares must be within the interval (0, 1].
+    """
+    share = Fraction(str(value))
+    if not 0 < share <= 1:
+        raise ValueError(f"Share must be greater than 0 and at most 1: {value}")
+    return share
+
+
 @define
 class SignificantItemsBase:
     """
@@ -183,19 +215,20 @@ class SignificantItemsBase:
 
     session: Session
     search: GitHubSearch
+    concurrency: int = 4
+    share: Fraction = attr.field(default=Fraction(1, 10), converter=to_fraction)
+    rankings: t.List[t.List[str]] = attr.field(
+        default=attr.Factory(
+            lambda self: [self.by_size_sort_attributes, self.by_comments_sort_attributes],
+            takes_self=True,
+        )
+    )
     metadata_class: t.ClassVar[t.Type[t.Union[IssueMetadata, PullRequestMetadata]]]
+    kind: t.ClassVar[QKind]
     description: t.ClassVar[str]
     by_size_sort_attributes: t.ClassVar[t.List[str]]
     by_comments_sort_attributes: t.ClassVar[t.List[str]]
 
-    @property
-    @abstractmethod
-    def api_url(self):
-        """
-        Implemented individually between Issue vs. PRs.
-        """
-        raise NotImplementedError()
-
     @staticmethod
     @abstractmethod
     def decode_url(item):
@@ -207,43 +240,46 @@ class SignificantItemsBase:
     def items(self):
         """
         Acquire items from GitHub API.
+
+        Hydrate search results in batches per GraphQL API, falling back to the REST API.
         """
-        items = []
-        response = self.session.get(self.api_url)
-        response.raise_for_status()
-        for item in tqdm(response.json()["items"], desc=self.description, leave=False):
-            url = self.decode_url(item)
-            response = self.session.get(url)
-            response.raise_for_status()
-            data = response.json()
-            cm = self.metadata_class.from_dict(data)  # type: ignore[attr-defined,union-attr]
-            items.append(cm)
-        return items
+        candidates = list(self.search.find(self.kind))
+        try:
+            records = GitHubGraphQLHydrator(self.session, description=self.description).hydrate(
+                candidates, kind=self.kind
+            )
+        except GitHubHydrationError as ex:
+            logger.warning(f"{ex}. Falling back to REST API.")
+            hydrator = GitHubRestHydrator(
+                self.session, description=self.description, concurrency=self.concurrency
+            )
+            records = hydrator.hydrate(candidates, decode_url=self.decode_url)
+            self.search.incomplete += hydrator.incomplete
+        return [
+            self.metadata_class.from_dict(record)  # type: ignore[attr-defined,union-attr]
+            for record in records
+        ]
 
     def significant(self):
         """
-        Return 2/5 of the most significant PRs, or any other share.
+        Return the most significant items, selecting a share of candidates per ranking.
 
-        The list of candidates (all PRs within given time range) is sorted by
-        number of comments, number of changed files, and delta code size.
+        The list of candidates (all items within given time range) is ranked by
+        each of the `rankings`, e.g. by delta code size, number of changed files,
+        and number of comments. From each ranking, the top `share` of items, plus
+        one, is selected using a heap, and deduplicated by URL.
         """
         items_in = self.items()
         items_out = []
+        seen = set()
 
-        items_max = int(len(items_in) / 2 / 5) + 1
-
-        by_size_items = sorted(
-            items_in, key=attrgetter(*self.by_size_sort_attributes), reverse=True
-        )
-        items_out += by_size_items[:items_max]
+        items_max = int(len(items_in) * self.share) + 1
 
-        by_comments_items = sorted(
-            items_in, key=attrgetter(*self.by_comments_sort_attributes), reverse=True
-        )
-        # TODO: Need to deduplicate manually.
-        # items += by_comments_items[:items_max]
-        for item in by_comments_items[:items_max]:
-            if item not in items_out:
+        for attributes in self.rankings:
+            for item in heapq.nlargest(items_max, items_in, key=attrgetter(*attributes)):
+                if item.html_url in seen:
+                    continue
+                seen.add(item.html_url)
                 items_out.append(item)
 
         return items_out
@@ -261,14 +297,11 @@ class GitHubSignificantIssues(SignificantItemsBase):
     """
 
     metadata_class = IssueMetadata
+    kind = QKind.ISSUE
     description = "Fetching issues"
     by_size_sort_attributes: t.ClassVar[t.List[str]] = ["comments_total"]
     by_comments_sort_attributes: t.ClassVar[t.List[str]] = ["comments_total"]
 
-    @property
-    def api_url(self):
-        return self.search.issues_api
-
     @staticmethod
     def decode_url(item):
         return item["url"]
@@ -281,6 +314,7 @@ class GitHubSignificantPullRequests(SignificantItemsBase):
     """
 
     metadata_class = PullRequestMetadata
+    kind = QKind.PULLREQUEST
     description = "Fetching pull requests"
     by_size_sort_attributes: t.ClassVar[t.List[str]] = [
         "code_size",
@@ -293,10 +327,6 @@ class GitHubSignificantPullRequests(SignificantItemsBase):
         "code_size",
     ]
 
-    @property
-    def api_url(self):
-        return self.search.pulls_api
-
     @staticmethod
     def decode_url(item):
         return item["pull_request"]["url"]
@@ -10,6 +10,7 @@ from rapporto.source.github.model import (
     GitHubQueryBuilder,
     GitHubSearch,
     MarkdownContent,
+    incomplete_notice,
 )
 from rapporto.source.github.util import GitHubHttpClient, repository_name
 from rapporto.util import goosefeet, sanitize_title
@@ -43,6 +44,9 @@ class GitHubAttentionReport:
     Report about important items that deserve your attention, bugs first.
 
     Find all issues and pull requests with labels "bug" or "important".
+    When `items` are given, for example prefetched for a wider time range,
+    they are used instead of inquiring the GitHub API. Reasons why they are
+    incomplete can be given using `incomplete`.
     """
 
     label_section_map: t.ClassVar[t.OrderedDict[str, str]] = OrderedDict(
@@ -58,19 +62,36 @@ class GitHubAttentionReport:
         "incident": ["type: incident"],
     }
 
-    def __init__(self, inquiry: GitHubInquiry):
+    def __init__(
+        self,
+        inquiry: GitHubInquiry,
+        items: t.Optional[t.List[t.Dict[str, t.Any]]] = None,
+        incomplete: t.Optional[t.List[str]] = None,
+    ):
         self.inquiry = inquiry
-        self.session = GitHubHttpClient.session
+        self.prefetched = items
+        self.session = GitHubHttpClient.get_session()
         self.search = GitHubSearch.with_query_builder(
             self.session, GitHubAttentionQueryBuilder(inquiry=inquiry)
         )
+        self.search.incomplete += incomplete or []
+
+    @property
+    def incomplete(self) -> t.List[str]:
+        """
+        Reasons why the report is incomplete.
+        """
+        return self.search.incomplete
 
     @property
     def items(self):
         """
         Return GitHub issues and PRs in scope of search constraints.
         """
-        items = self.search.issues_and_prs()
+        if self.prefetched is not None:
+            items = self.prefetched
+        else:
+            items = list(self.search.issues_and_prs())
         return sorted(munchify(items), key=attrgetter("created_at"))
 
     def has_relevant_label(self, item) -> t.Optional[Munch]:
@@ -130,7 +151,7 @@ class GitHubAttentionReport:
 
 A report about important items that deserve your attention, bugs first.
 - Time range: {self.search.query_builder.timeinterval.githubformat() or "n/a"}
-- Details: {link_issues}, {link_pulls}
+- Details: {link_issues}, {link_pulls}{incomplete_notice(self.incomplete)}
 
 {body}
         """.strip()
@@ -4,12 +4,13 @@ from pathlib import Path
 import click
 from click_aliases import ClickAliasedGroup
 
-from rapporto.option import format_option
+from rapporto.option import format_option, github_http_options
 from rapporto.source.github.actions import GitHubActionsReport
-from rapporto.source.github.activity import GitHubActivityReport
+from rapporto.source.github.activity import GitHubActivityReport, to_fraction
 from rapporto.source.github.attention import GitHubAttentionReport
 from rapporto.source.github.backup import GitHubBackup
 from rapporto.source.github.model import GitHubInquiry, GitHubMultiRepositoryInquiry, GitHubOptions
+from rapporto.source.github.util import GitHubHttpClient
 from rapporto.util import to_mrkdwn
 
 organization_option = click.option("--organization", "--org", type=str, required=False)
@@ -21,33 +22,61 @@ repository_option = click.option(
     required=True,
     help="GitHub repository, single or path to file",
 )
+concurrency_option = click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    required=False,
+    default=4,
+    help="Number of repositories to inquire concurrently. Default: 4",
+)
+
+
+def validate_share(ctx: click.Context, param: click.Parameter, value: t.Optional[str]):
+    if value is not None:
+        try:
+            to_fraction(value)
+        except ZeroDivisionError as ex:
+            raise click.BadParameter(f"Invalid share: {value}") from ex
+        except ValueError as ex:
+            raise click.BadParameter(str(ex)) from ex
+    return value
 
 
 @click.group(cls=ClickAliasedGroup)
+@github_http_options
 @click.pass_context
 def cli(ctx: click.Context):
     """
     Harvest information from GitHub.
     """
-    pass
+    GitHubHttpClient.configure(**ctx.meta.get("github_http_options", {}))
+    ctx.call_on_close(GitHubHttpClient.report_statistics)
 
 
 @cli.command(aliases=["ppp"])
 @organization_option
 @author_option
 @when_option
+@click.option(
+    "--share",
+    type=str,
+    required=False,
+    callback=validate_share,
+    help="Share of top items to select per ranking, e.g. 1/3. Default: 1/10",
+)
 @format_option
 def activity(
     organization: t.Optional[str] = None,
     author: t.Optional[str] = None,
     when: t.Optional[str] = None,
+    share: t.Optional[str] = None,
     format_: t.Optional[str] = None,
 ):
     """
     Activities of individual authors.
     """
     inquiry = GitHubInquiry(organization=organization, author=author, updated=when)
-    report = GitHubActivityReport(inquiry=inquiry)
+    report = GitHubActivityReport(inquiry=inquiry, share=share)
     print_output(report, format_)
 
 
@@ -63,17 +92,21 @@ def print_output(report, format_):
 @cli.command(aliases=["ci"])
 @repository_option
 @when_option
+@concurrency_option
 @format_option
 def actions(
     repository: t.Union[str, Path],
     when: t.Optional[str] = None,
+    concurrency: int = 4,
     format_: t.Optional[str] = None,
 ):
     """
     CI/GHA failures.
     """
     options = GitHubOptions().add_repos(repository)
-    inquiry = GitHubMultiRepositoryInquiry(repositories=options.repositories, created=when)
+    inquiry = GitHubMultiRepositoryInquiry(
+        repositories=options.repositories, created=when, concurrency=concurrency
+    )
     report = GitHubActionsReport(inquiry=inquiry)
     print_output(report, format_)
 
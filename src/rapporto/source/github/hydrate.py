@@ -0,0 +1,189 @@
+"""
+Hydrate search results with details about individual issues and pull requests.
+
+The GitHub Search API does not include metrics like code size and number of review
+comments. Acquire them either per GraphQL API, in batches, or per REST API, one
+request per item.
+"""
+
+import logging
+import threading
+import typing as t
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import RequestException, Session
+from tqdm import tqdm
+
+from rapporto.source.github.model import QKind
+from rapporto.source.github.util import GitHubHttpClient, GitHubRateLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubHydrationError(Exception):
+    pass
+
+
+class GitHubRestHydrator:
+    """
+    Hydrate items per REST API, using one request per item.
+
+    Requests are submitted concurrently, using a bounded pool of workers, and
+    limiting the number of concurrent requests per host to `per_host`, because
+    GitHub discourages concurrent requests to its API. The pool is sized to not
+    exceed the per-host limit across all hosts, so no workers idle waiting for
+    a host. When the rate limit is exhausted, the remaining items are skipped.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        description: t.Optional[str] = None,
+        concurrency: int = 4,
+        per_host: int = 2,
+    ):
+        self.session = session
+        self.description = description
+        self.concurrency = concurrency
+        self.per_host = min(per_host, concurrency)
+        self.host_semaphores: t.Dict[str, threading.BoundedSemaphore] = {}
+        # Reasons why results are incomplete, e.g. an exhausted rate limit.
+        self.incomplete: t.List[str] = []
+        self.lock = threading.Lock()
+
+    def hydrate(
+        self, items: t.List[t.Dict[str, t.Any]], decode_url: t.Callable[[t.Dict[str, t.Any]], str]
+    ) -> t.List[t.Dict[str, t.Any]]:
+        urls = [decode_url(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.workers(urls)) as executor:
+            records = list(
+                tqdm(
+                    executor.map(self.fetch, urls),
+                    total=len(urls),
+                    desc=self.description,
+                    leave=False,
+                )
+            )
+        return [record for record in records if record is not None]
+
+    def workers(self, urls: t.List[str]) -> int:
+        """
+        Number of workers, bounded by the per-host limit across all hosts.
+        """
+        hosts = {urllib.parse.urlparse(url).netloc for url in urls}
+        return max(1, min(self.concurrency, self.per_host * len(hosts)))
+
+    def fetch(self, url: str) -> t.Optional[t.Dict[str, t.Any]]:
+        with self.host_semaphore(url):
+            try:
+                response = self.session.get(url)
+            except GitHubRateLimitExceeded as ex:
+                logger.warning(f"Skipping item: {ex}")
+                self.incomplete.append(f"Skipped items: {ex}")
+                return None
+        response.raise_for_status()
+        record = response.json()
+        if record.get("state") == "closed":
+            GitHubHttpClient.pin_response(self.session, response)
+        return record
+
+    def host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlparse(url).netloc
+        with self.lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_semaphores[host]
+
+
+class GitHubGraphQLHydrator:
+    """
+    Hydrate items per GraphQL API, using one request per batch of up to 100 items.
+
+    Records are shaped like responses of the REST API, so they can be decoded
+    using the same metadata classes.
+
+    https://docs.github.com/en/graphql/reference/queries#nodes
+    """
+
+    url = "https://api.github.com/graphql"
+    batch_size = 100
+
+    query_pulls = """
+    query($ids: [ID!]!) {
+      nodes(ids: $ids) {
+        ... on PullRequest {
+          id
+          number
+          title
+          additions
+          deletions
+          changedFiles
+          commits { totalCount }
+          comments { totalCount }
+          reviews(first: 100) { nodes { comments { totalCount } } }
+          baseRepository { name }
+        }
+      }
+    }
+    """
+
+    def __init__(self, session: Session, description: t.Optional[str] = None):
+        self.session = session
+        self.description = description
+
+    def hydrate(self, items: t.List[t.Dict[str, t.Any]], kind: QKind) -> t.List[t.Dict[str, t.Any]]:
+        """
+        Hydrate items, returning records in the same order.
+
+        Issue items from the search API already include all relevant fields.
+        Pull request items without a corresponding GraphQL node are skipped.
+        """
+        if kind == QKind.ISSUE:
+            return items
+        records = []
+        batches = range(0, len(items), self.batch_size)
+        for offset in tqdm(batches, desc=self.description, leave=False):
+            batch = items[offset : offset + self.batch_size]
+            nodes = self.query(self.query_pulls, ids=[item["node_id"] for item in batch])
+            for item, node in zip(batch, nodes):
+                if not node:
+                    logger.warning(f"Unable to hydrate item per GraphQL: {item['html_url']}")
+                    continue
+                records.append(self.pull_request_record(item, node))
+        return records
+
+    def query(self, query: str, **variables) -> t.List[t.Dict[str, t.Any]]:
+        try:
+            response = self.session.post(self.url, json={"query": query, "variables": variables})
+            response.raise_for_status()
+            data = response.json()
+        except (RequestException, ValueError) as ex:
+            raise GitHubHydrationError(f"GraphQL request failed: {ex}") from ex
+        if data.get("errors") or not data.get("data"):
+            raise GitHubHydrationError(f"GraphQL query failed: {data.get('errors')}")
+        return data["data"]["nodes"]
+
+    @staticmethod
+    def pull_request_record(
+        item: t.Dict[str, t.Any], node: t.Dict[str, t.Any]
+    ) -> t.Dict[str, t.Any]:
+        """
+        Shape a GraphQL pull request node like a REST API pull request resource.
+        """
+        review_comments = sum(
+            review["comments"]["totalCount"] for review in node["reviews"]["nodes"] or []
+        )
+        return {
+            "number": node["number"],
+            "url": item["pull_request"]["url"],
+            "html_url": item["html_url"],
+            "title": node["title"],
+            "commits": node["commits"]["totalCount"],
+            "additions": node["additions"],
+            "deletions": node["deletions"],
+            "changed_files": node["changedFiles"],
+            "comments": node["comments"]["totalCount"],
+            "review_comments": review_comments,
+            "base": {"repo": {"name": node["baseRepository"]["name"]}},
+        }
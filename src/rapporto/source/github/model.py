@@ -5,6 +5,7 @@ import typing as t
 import urllib.parse
 from abc import abstractmethod
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
 
@@ -13,6 +14,8 @@ import dateparser
 from aika import TimeInterval, TimeIntervalParser
 from attrs import define
 
+from rapporto.source.github.util import GitHubHttpClient, GitHubRateLimitExceeded, paginate
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +58,7 @@ class GitHubInquiry:
 class GitHubMultiRepositoryInquiry:
     repositories: t.List[str]
     created: t.Optional[str] = None
+    concurrency: int = 4
 
 
 class QType(Enum):
@@ -73,8 +77,9 @@ class GitHubQueryBuilder:
     )
     template_html = "https://github.com/search?q={query}&per_page=100&s=created&o=asc"
 
-    def __init__(self, inquiry: GitHubInquiry):
+    def __init__(self, inquiry: GitHubInquiry, interval: t.Optional[TimeInterval] = None):
         self.inquiry = inquiry
+        self.interval = interval
         self.type: t.Optional[QType] = None
         self.kind: t.Optional[QKind] = None
         self.constraints: t.List[str] = []
@@ -98,7 +103,13 @@ class GitHubQueryBuilder:
 
     @property
     def timeinterval(self) -> TimeInterval:
-        return timeinterval(self.inquiry.updated)
+        return self.interval or timeinterval(self.inquiry.updated)
+
+    def with_interval(self, interval: TimeInterval) -> "GitHubQueryBuilder":
+        """
+        Derive a query builder for the same inquiry, constrained to another time interval.
+        """
+        return type(self)(inquiry=self.inquiry, interval=interval)
 
     @property
     def timerange(self) -> str:
@@ -131,6 +142,11 @@ class GitHubQueryBuilder:
         self.type = QType.HTML
         return self
 
+    def for_kind(self, kind: QKind, type_: QType = QType.API) -> "GitHubQueryBuilder":
+        self.kind = kind
+        self.type = type_
+        return self
+
     def url(self):
         if self.type == QType.API:
             template = self.template_api
@@ -155,6 +171,8 @@ class GitHubSearch:
     pulls_api: str
     issues_html: str
     pulls_html: str
+    # Reasons why results are incomplete, e.g. an exhausted rate limit.
+    incomplete: t.List[str] = attr.field(factory=list)
 
     @classmethod
     def with_query_builder(cls, session, query_builder: GitHubQueryBuilder):
@@ -167,18 +185,183 @@ class GitHubSearch:
             pulls_html=query_builder.pr().html().url(),
         )
 
-    def issues_and_prs(self):
-        items = []
+    # The GitHub Search API provides up to 1,000 results for each search.
+    # https://docs.github.com/en/rest/search/search#about-search
+    RESULTS_MAX: t.ClassVar[int] = 1000
+
+    def items(self, url: str) -> t.Iterator[t.Dict[str, t.Any]]:
+        """
+        Lazily enumerate all items of a search query, following pagination links.
+
+        When the rate limit is exhausted, the results are incomplete.
+        """
+        count = 0
+        try:
+            for response in paginate(self.session, url):
+                response.raise_for_status()
+                data = response.json()
+                if count == 0 and data.get("total_count", 0) > self.RESULTS_MAX:
+                    logger.warning(
+                        f"Search results truncated to {self.RESULTS_MAX} "
+                        f"of {data['total_count']} items: {url}"
+                    )
+                if data.get("incomplete_results"):
+                    logger.warning(f"Search results incomplete, the query timed out: {url}")
+                for item in data["items"]:
+                    yield item
+                    count += 1
+                    if count >= self.RESULTS_MAX:
+                        return
+        except GitHubRateLimitExceeded as ex:
+            logger.warning(f"Search results incomplete: {ex}")
+            self.incomplete.append(f"Search results incomplete: {ex}")
+
+    def find(self, kind: QKind) -> t.Iterator[t.Dict[str, t.Any]]:
+        """
+        Enumerate all items of a given kind, splitting the query when hitting the results cap.
+        """
+        return GitHubSearchPlanner(search=self).items(kind)
+
+    def issues_and_prs(self) -> t.Iterator[t.Dict[str, t.Any]]:
+        """
+        Enumerate issues and pull requests.
+
+        While issues are streamed, pull requests are fetched concurrently in the background.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pulls = executor.submit(list, self.find(QKind.PULLREQUEST))
+            yield from self.find(QKind.ISSUE)
+            yield from pulls.result()
+
+
+class GitHubTimeInterval(TimeInterval):
+    """
+    A time interval which renders its bounds including the time of day, if needed.
 
-        response = self.session.get(self.issues_api)
-        response.raise_for_status()
-        items += response.json()["items"]
+    GitHub's search syntax accepts both `2025-03-01` and `2025-03-01T12:00:00`.
+    """
+
+    def githubformat(self) -> str:
+        end = self.end or self.start
+        if self.start.time() == dt.time.min and end.time() == dt.time.min:
+            return super().githubformat()
+        github_datetime_format = "%Y-%m-%dT%H:%M:%S"
+        return (
+            f"{self.start.strftime(github_datetime_format)}..{end.strftime(github_datetime_format)}"
+        )
 
-        response = self.session.get(self.pulls_api)
+
+@define
+class GitHubSearchPlanner:
+    """
+    Plan search queries, to overcome the results cap of the GitHub Search API.
+
+    When a query matches more results than the API returns, its time interval is
+    bisected recursively. Sub-queries are executed in parallel, and their results
+    are merged, deduplicated by `html_url`.
+
+    Probing a query requests its first page, which will be served from the HTTP
+    cache when enumerating the items afterwards.
+    """
+
+    search: GitHubSearch
+    concurrency: int = 4
+    resolution: dt.timedelta = dt.timedelta(minutes=1)
+
+    def items(self, kind: QKind) -> t.Iterator[t.Dict[str, t.Any]]:
+        seen = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            intervals = self.plan(executor, kind)
+            urls = [self.url(kind, interval) for interval in intervals]
+            for items in executor.map(lambda url: list(self.search.items(url)), urls):
+                for item in items:
+                    if item["html_url"] in seen:
+                        continue
+                    seen.add(item["html_url"])
+                    yield item
+
+    def plan(self, executor: ThreadPoolExecutor, kind: QKind) -> t.List[GitHubTimeInterval]:
+        """
+        Compute time intervals whose queries stay within the results cap, level by level.
+
+        Splitting stops when the remaining budget of the search rate limit runs low.
+        """
+        interval = self.search.query_builder.timeinterval
+        pending = [
+            GitHubTimeInterval(
+                start=dt.datetime.combine(interval.start.date(), dt.time.min),
+                end=dt.datetime.combine((interval.end or interval.start).date(), dt.time.min),
+            )
+        ]
+        intervals = []
+        while pending:
+            totals = executor.map(lambda iv: self.count(self.url(kind, iv)), pending)
+            bisected = []
+            budget = GitHubHttpClient.scheduler.remaining("search")
+            for candidate, total in zip(pending, list(totals)):
+                halves = self.bisect(candidate)
+                if budget is not None and budget < 2 * len(halves):
+                    logger.warning(
+                        f"Not splitting search interval, search rate limit budget is low: "
+                        f"{candidate.githubformat()}"
+                    )
+                    halves = []
+                if total > self.search.RESULTS_MAX and halves:
+                    logger.info(
+                        f"Splitting search interval with {total} results: "
+                        f"{candidate.githubformat()}"
+                    )
+                    bisected += halves
+                    if budget is not None:
+                        budget -= len(halves)
+                else:
+                    intervals.append(candidate)
+            pending = bisected
+        return sorted(intervals, key=lambda iv: iv.start)
+
+    def bisect(self, interval: GitHubTimeInterval) -> t.List[GitHubTimeInterval]:
+        """
+        Split a time interval into two halves, first by days, then by time of day.
+
+        Interval bounds are inclusive. Date-only intervals span whole days.
+        """
+        start = interval.start
+        end = interval.end or interval.start
+        one_day = dt.timedelta(days=1)
+        one_second = dt.timedelta(seconds=1)
+        if start.time() == dt.time.min and end.time() == dt.time.min:
+            days = (end - start).days + 1
+            if days > 1:
+                middle = start + (days // 2) * one_day
+                return [
+                    GitHubTimeInterval(start=start, end=middle - one_day),
+                    GitHubTimeInterval(start=middle, end=end),
+                ]
+            end = start + one_day - one_second
+        if end - start < self.resolution:
+            return []
+        middle = start + (end - start) // 2
+        middle = middle.replace(microsecond=0)
+        return [
+            GitHubTimeInterval(start=start, end=middle),
+            GitHubTimeInterval(start=middle + one_second, end=end),
+        ]
+
+    def count(self, url: str) -> int:
+        """
+        Inquire the total number of results of a search query.
+        """
+        try:
+            response = self.search.session.get(url)
+        except GitHubRateLimitExceeded as ex:
+            logger.warning(f"Unable to count search results: {ex}")
+            self.search.incomplete.append(f"Unable to count search results: {ex}")
+            return 0
         response.raise_for_status()
-        items += response.json()["items"]
+        return response.json()["total_count"]
 
-        return items
+    def url(self, kind: QKind, interval: TimeInterval) -> str:
+        return self.search.query_builder.with_interval(interval).for_kind(kind).url()
 
 
 @dataclasses.dataclass()
@@ -205,6 +388,20 @@ class MarkdownContent:
         return "\n".join(sections)
 
 
+def incomplete_notice(reasons: t.Iterable[str]) -> str:
+    """
+    Render a notice about incomplete results, e.g. when the rate limit was exhausted.
+
+    The notice starts with a blank line, so it can be appended to any line.
+    """
+    reasons = sorted(set(reasons))
+    if not reasons:
+        return ""
+    lines = ["", "", "> **Incomplete:** This report is missing information from GitHub."]
+    lines += [f"> - {reason}" for reason in reasons]
+    return "\n".join(lines)
+
+
 def timeinterval(when: t.Optional[str] = None) -> TimeInterval:
     if when is None:
         return TimeInterval(dt.datetime.today())
@@ -1,8 +1,21 @@
+import dataclasses
+import datetime as dt
+import json
 import logging
 import os
+import random
+import threading
+import time
+import typing as t
 import urllib.parse
+from collections import Counter
+from pathlib import Path
 
 import requests_cache
+from requests import PreparedRequest, RequestException, Response, Session
+from requests.adapters import HTTPAdapter
+
+from rapporto.util import cache_path
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +38,453 @@ def repository_name(url: str, with_org: bool = False) -> str:
         return parts[2]
 
 
+class GitHubRateLimiter:
+    """
+    Pace requests across threads, to respect GitHub's secondary rate limits.
+
+    A token bucket, permitting short bursts of `burst` requests, while sustaining
+    `rate` requests per second on average.
+
+    https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api#about-secondary-rate-limits
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.timestamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Block until the next request is permitted.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.timestamp) * self.rate)
+            self.timestamp = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        if delay:
+            logger.debug(f"Pacing request for {delay:.2f} seconds")
+            time.sleep(delay)
+
+
+def paginate(session: Session, url: str) -> t.Iterator[Response]:
+    """
+    Request all pages of a GitHub API resource, following `Link: rel="next"` headers.
+
+    Responses are yielded lazily, so consumers can stop early. Iteration ends after
+    the first unsuccessful response, which is yielded for inspection by the caller.
+
+    https://docs.github.com/en/rest/using-the-rest-api/using-pagination-in-the-rest-api
+    """
+    next_url: t.Optional[str] = url
+    while next_url:
+        response = session.get(next_url)
+        yield response
+        if not response.ok:
+            return
+        next_url = response.links.get("next", {}).get("url")
+
+
+class GitHubRateLimitExceeded(RequestException):
+    """
+    The rate limit is exhausted, and waiting for its reset would take too long.
+    """
+
+
+@dataclasses.dataclass
+class GitHubRateLimitBudget:
+    """
+    The rate limit budget of a GitHub API resource, as reported by `X-RateLimit-*` headers.
+    """
+
+    resource: str
+    limit: int
+    remaining: int
+    reset: float
+
+    @property
+    def wait(self) -> float:
+        """
+        Seconds until the budget resets.
+        """
+        return max(0.0, self.reset - time.time())
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining <= 0 and self.wait > 0
+
+
+class GitHubRateLimitScheduler:
+    """
+    Schedule requests to the GitHub API, respecting its primary and secondary rate limits.
+
+    The budget of each API resource, e.g. `core`, `search`, or `graphql`, is tracked
+    using the `X-RateLimit-*` response headers. When a budget is exhausted, requests
+    wait for its reset, or fail with `GitHubRateLimitExceeded` when that would take
+    longer than `max_wait` seconds. Requests rejected by a secondary rate limit are
+    retried after the time designated by the `Retry-After` header, or after an
+    exponential backoff, including random jitter.
+
+    https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api
+    """
+
+    def __init__(self, max_wait: float = 60.0, retries: int = 3, backoff: float = 1.0):
+        self.max_wait = max_wait
+        self.retries = retries
+        self.backoff = backoff
+        # The search API permits 30 requests per minute.
+        self.limiters = {
+            "core": GitHubRateLimiter(),
+            "graphql": GitHubRateLimiter(),
+            "search": GitHubRateLimiter(rate=0.5, burst=5),
+        }
+        self.budgets: t.Dict[str, GitHubRateLimitBudget] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def resource(url: str) -> str:
+        """
+        Derive the rate limit resource from the request URL.
+        """
+        path = urllib.parse.urlparse(url).path
+        if path.startswith("/search/"):
+            return "search"
+        if path.startswith("/graphql"):
+            return "graphql"
+        return "core"
+
+    def remaining(self, resource: str = "core") -> t.Optional[int]:
+        """
+        Return the remaining budget of a resource, or `None` when it is not known yet.
+        """
+        budget = self.budgets.get(resource)
+        if budget is None:
+            return None
+        if budget.wait == 0:
+            return budget.limit
+        return budget.remaining
+
+    def acquire(self, resource: str) -> None:
+        """
+        Block until the next request to the given resource is permitted.
+        """
+        budget = self.budgets.get(resource)
+        if budget is not None and budget.exhausted:
+            self.wait(budget.wait, f"Rate limit for {resource} exhausted")
+        self.limiters.get(resource, self.limiters["core"]).acquire()
+
+    def wait(self, delay: float, reason: str) -> None:
+        if delay > self.max_wait:
+            raise GitHubRateLimitExceeded(f"{reason}, resets in {delay:.0f} seconds")
+        logger.warning(f"{reason}, waiting for {delay:.0f} seconds")
+        time.sleep(delay)
+
+    def update(self, response: Response) -> None:
+        """
+        Track the budget reported by the response headers.
+        """
+        headers = response.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        resource = headers.get("X-RateLimit-Resource") or self.resource(response.url)
+        budget = GitHubRateLimitBudget(
+            resource=resource,
+            limit=int(headers.get("X-RateLimit-Limit", 0)),
+            remaining=int(headers["X-RateLimit-Remaining"]),
+            reset=float(headers.get("X-RateLimit-Reset", 0)),
+        )
+        with self.lock:
+            self.budgets[resource] = budget
+
+    def retry_delay(self, response: Response, attempt: int) -> t.Optional[float]:
+        """
+        Compute the delay before retrying a rate-limited request, or `None` if it was not.
+        """
+        if response.status_code not in (403, 429):
+            return None
+        headers = response.headers
+        if "Retry-After" in headers:
+            delay = float(headers["Retry-After"])
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            delay = float(headers.get("X-RateLimit-Reset", 0)) - time.time()
+        elif response.status_code == 429 or "rate limit" in response.text.lower():
+            delay = self.backoff * 2**attempt
+        else:
+            return None
+        return max(0.0, delay) + random.uniform(0, self.backoff)  # noqa: S311
+
+
+class GitHubRateLimitAdapter(HTTPAdapter):
+    """
+    An HTTP adapter scheduling requests using a `GitHubRateLimitScheduler`.
+
+    Adapters are only used for requests going to the network, so responses
+    served from the HTTP cache do not count against the budget. When a request
+    is still rate-limited after all retries, it fails with `GitHubRateLimitExceeded`.
+    """
+
+    def __init__(self, scheduler: GitHubRateLimitScheduler, **kwargs):
+        self.scheduler = scheduler
+        super().__init__(**kwargs)
+
+    def send(self, request: PreparedRequest, *args, **kwargs) -> Response:  # type: ignore[override]
+        resource = self.scheduler.resource(request.url or "")
+        attempt = 0
+        while True:
+            self.scheduler.acquire(resource)
+            response = super().send(request, *args, **kwargs)
+            self.scheduler.update(response)
+            delay = self.scheduler.retry_delay(response, attempt)
+            if delay is None:
+                return response
+            if attempt >= self.scheduler.retries:
+                raise GitHubRateLimitExceeded(
+                    f"Request rate-limited after {attempt} retries: {request.url}",
+                    request=request,
+                    response=response,
+                )
+            self.scheduler.wait(delay, f"Request rate-limited: {request.url}")
+            attempt += 1
+
+
+def mount_pool(
+    session: Session, maxsize: int, scheduler: t.Optional[GitHubRateLimitScheduler] = None
+) -> Session:
+    """
+    Size the HTTP connection pool, so concurrent workers can reuse keep-alive connections.
+
+    When a scheduler is given, requests to the GitHub API respect its rate limits.
+    """
+    adapter = HTTPAdapter(pool_connections=maxsize, pool_maxsize=maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if scheduler is not None:
+        session.mount(
+            "https://api.github.com/",
+            GitHubRateLimitAdapter(scheduler, pool_connections=maxsize, pool_maxsize=maxsize),
+        )
+    return session
+
+
+def cache_policies() -> requests_cache.ExpirationPatterns:
+    """
+    Expiration times in seconds per API endpoint, matched in order.
+
+    Search results change quickly, while details about individual issues and
+    pull requests are comparatively stable.
+    """
+    return {
+        "api.github.com/search/": 300,
+        "api.github.com/repos/*/actions/runs": 600,
+        "api.github.com/repos/*/pulls/": 3600,
+        "api.github.com/repos/*/issues/": 3600,
+    }
+
+
+@dataclasses.dataclass
+class GitHubHttpOptions:
+    """
+    Options for HTTP sessions to the GitHub API.
+
+    When `token` is not given, it is read from the `GH_TOKEN` environment variable
+    at the time the session is created. When `cache_name` is not given, the cache
+    is stored within the user cache directory.
+
+    Expired responses are revalidated using conditional requests, based on their
+    `ETag` or `Last-Modified` headers. A `304 Not Modified` response does not count
+    against GitHub's primary rate limit. Use `revalidate` to always revalidate
+    responses, even when they have not expired yet.
+
+    https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api#use-conditional-requests-if-appropriate
+    """
+
+    cache_name: t.Optional[str] = None
+    backend: str = "sqlite"
+    expire_after: int = 3600
+    urls_expire_after: requests_cache.ExpirationPatterns = dataclasses.field(
+        default_factory=cache_policies
+    )
+    immutable_expire_after: int = 30 * 86400
+    revalidate: bool = False
+    token: t.Optional[str] = None
+    pool_maxsize: int = 16
+
+    @property
+    def cache_location(self) -> str:
+        return self.cache_name or str(cache_path() / "http_cache")
+
+    @property
+    def statistics_path(self) -> Path:
+        return Path(f"{self.cache_location}.stats.json")
+
+
+class GitHubCacheStatistics:
+    """
+    Count HTTP responses served from the cache, revalidated, or fetched from the network.
+    """
+
+    OUTCOMES: t.ClassVar[t.List[str]] = ["hit", "revalidated", "miss"]
+
+    def __init__(self):
+        self.counter: t.Counter[str] = Counter()
+        self.lock = threading.Lock()
+
+    def hook(self, response: Response, *args, **kwargs) -> None:
+        """
+        Count a response, to be used as a `response` hook on a cached session.
+        """
+        # Responses from the network are dispatched to hooks twice, first before
+        # they have been wrapped by `requests_cache`. Only count wrapped responses.
+        if not hasattr(response, "from_cache"):
+            return
+        if getattr(response, "revalidated", False):
+            outcome = "revalidated"
+        elif response.from_cache:
+            outcome = "hit"
+        else:
+            outcome = "miss"
+        with self.lock:
+            self.counter[outcome] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.counter.values())
+
+    @staticmethod
+    def ratio(counter: t.Mapping[str, int]) -> float:
+        """
+        Share of responses which did not need to be downloaded again.
+        """
+        total = sum(counter.values())
+        if not total:
+            return 0.0
+        return (counter.get("hit", 0) + counter.get("revalidated", 0)) / total
+
+    @classmethod
+    def format(cls, counter: t.Mapping[str, int]) -> str:
+        counts = ", ".join(f"{outcome}={counter.get(outcome, 0)}" for outcome in cls.OUTCOMES)
+        return f"{counts}, ratio={cls.ratio(counter):.0%}"
+
+    @staticmethod
+    def load(path: Path) -> t.Counter[str]:
+        """
+        Load cumulative counts of previous runs.
+        """
+        try:
+            return Counter(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            return Counter()
+
+    def save(self, path: Path) -> None:
+        """
+        Add counts of this run to the cumulative counts.
+        """
+        counter = self.load(path)
+        counter.update(self.counter)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(dict(counter)))
+
+
 class GitHubHttpClient:
-    session = requests_cache.CachedSession(backend="sqlite", expire_after=3600)
-    if "GH_TOKEN" in os.environ:
-        session.headers.update({"Authorization": f"Bearer {os.getenv('GH_TOKEN')}"})
-    else:
-        logger.warning("GH_TOKEN not defined. This will exhaust the rate limit quickly.")
+    """
+    Provide HTTP sessions to the GitHub API.
+
+    The session is created lazily on first use, once per process, so programs
+    not talking to GitHub do not pay for opening the cache database, and forked
+    workers do not share connections.
+    """
+
+    options = GitHubHttpOptions()
+    scheduler = GitHubRateLimitScheduler()
+    statistics = GitHubCacheStatistics()
+    _sessions: t.ClassVar[t.Dict[int, Session]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, **options) -> None:
+        """
+        Adjust session options, and discard sessions created using previous options.
+        """
+        cls.options = dataclasses.replace(cls.options, **options)
+        cls.reset()
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._sessions.clear()
+            cls.statistics = GitHubCacheStatistics()
+
+    @classmethod
+    def get_session(cls) -> Session:
+        """
+        Return the session of the current process, creating it on demand.
+        """
+        pid = os.getpid()
+        with cls._lock:
+            if pid not in cls._sessions:
+                session = cls.create_session(cls.options, scheduler=cls.scheduler)
+                session.hooks["response"].append(cls.statistics.hook)
+                cls._sessions[pid] = session
+            return cls._sessions[pid]
+
+    @staticmethod
+    def create_session(
+        options: t.Optional[GitHubHttpOptions] = None,
+        scheduler: t.Optional[GitHubRateLimitScheduler] = None,
+    ) -> Session:
+        """
+        Create an isolated session, using a sized connection pool, an HTTP cache,
+        and a rate limit scheduler.
+        """
+        options = options or GitHubHttpOptions()
+        scheduler = scheduler or GitHubRateLimitScheduler()
+        session = requests_cache.CachedSession(
+            cache_name=options.cache_location,
+            backend=options.backend,
+            expire_after=options.expire_after,
+            urls_expire_after=options.urls_expire_after,
+            always_revalidate=options.revalidate,
+        )
+        mount_pool(session, maxsize=options.pool_maxsize, scheduler=scheduler)
+        token = options.token or os.getenv("GH_TOKEN")
+        if token:
+            session.headers.update({"Authorization": f"Bearer {token}"})
+        else:
+            logger.warning("GH_TOKEN not defined. This will exhaust the rate limit quickly.")
+        return session
+
+    @classmethod
+    def report_statistics(cls) -> None:
+        """
+        Log remaining rate limit budgets, and cache hits and misses of this run.
+        Add the latter to the cumulative counts.
+        """
+        if cls.scheduler.budgets:
+            budgets = ", ".join(
+                f"{budget.resource}={budget.remaining}/{budget.limit}"
+                for budget in cls.scheduler.budgets.values()
+            )
+            logger.info(f"GitHub rate limit: {budgets}")
+        if not cls.statistics.total:
+            return
+        logger.info(f"HTTP cache: {GitHubCacheStatistics.format(cls.statistics.counter)}")
+        if cls.options.backend == "sqlite":
+            cls.statistics.save(cls.options.statistics_path)
+
+    @classmethod
+    def pin_response(cls, session: Session, response: Response) -> None:
+        """
+        Keep a response to an immutable resource, e.g. a closed issue, for a long time.
+
+        Responses served from the cache, or returned by non-caching sessions, are ignored.
+        """
+        cache = getattr(session, "cache", None)
+        if cache is None or getattr(response, "from_cache", False) or not response.ok:
+            return
+        expires = dt.datetime.now(dt.timezone.utc) + dt.timedelta(
+            seconds=cls.options.immutable_expire_after
+        )
+        cache.save_response(response, expires=expires)
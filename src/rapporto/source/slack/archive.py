@@ -0,0 +1,180 @@
+import json
+import logging
+import os
+import typing as t
+from datetime import datetime
+from urllib.parse import quote
+
+from pueblo_goof.slack.directory import SlackChannelDirectory
+from rapporto.source.slack.core import SlackThreadExporter
+from rapporto.util import sanitize_title
+
+logger = logging.getLogger(__name__)
+
+
+class SlackChannelArchiver:
+    """
+    Incrementally archive all threads of a Slack channel into Markdown documents.
+
+    The archiver persists the timestamp of the most recent message it has seen,
+    the high-water mark, and the state of each archived thread. Subsequent runs
+    only walk the channel history since the high-water mark, minus a lookback
+    period to catch up with replies to recent threads, and only export threads
+    that are new, or whose latest reply changed. Threads which failed to export
+    are recorded, and retried on subsequent runs.
+
+    New replies to threads started before the lookback period are not discovered,
+    so choose a lookback period matching the lifetime of conversations.
+
+    https://api.slack.com/methods/conversations.history
+    """
+
+    STATE_FILE: t.ClassVar[str] = "archive.json"
+    INDEX_FILE: t.ClassVar[str] = "index.md"
+
+    def __init__(
+        self,
+        exporter: SlackThreadExporter,
+        channel: str,
+        output_dir: str = "slack_archive",
+        lookback_days: int = 7,
+    ):
+        self.exporter = exporter
+        self.channel = channel
+        self.output_dir = output_dir
+        self.lookback = lookback_days * 86400
+        self.channel_id = SlackChannelDirectory(exporter.client).resolve(channel)
+        self.state = self.load()
+
+    @property
+    def state_file(self) -> str:
+        return os.path.join(self.output_dir, self.STATE_FILE)
+
+    @property
+    def index_file(self) -> str:
+        return os.path.join(self.output_dir, self.INDEX_FILE)
+
+    def load(self) -> t.Dict[str, t.Any]:
+        """
+        Load the archive state, or start afresh.
+
+        Refuse to use the archive of another channel.
+        """
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {"channel": self.channel_id, "latest_ts": None, "threads": {}, "failed": {}}
+        if state.get("channel") != self.channel_id:
+            raise ValueError(
+                f"Archive in {self.output_dir} belongs to channel {state.get('channel')}, "
+                f"not to channel {self.channel_id}"
+            )
+        state.setdefault("failed", {})
+        return state
+
+    def save(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.state_file, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+
+    @property
+    def oldest(self) -> t.Optional[str]:
+        """
+        The lower bound of the channel history to walk, using Slack message timestamps.
+        """
+        if self.state["latest_ts"] is None:
+            return None
+        return f"{max(float(self.state['latest_ts']) - self.lookback, 0):.6f}"
+
+    def history(self, limit: int = 200) -> t.Iterator[t.Dict[str, t.Any]]:
+        """
+        Enumerate all channel messages since the lower bound, following pagination cursors.
+        """
+        for page in self.exporter.client.conversations_history(
+            channel=self.channel_id, oldest=self.oldest, limit=limit
+        ):
+            yield from page["messages"]
+
+    def is_changed(self, message: t.Dict[str, t.Any]) -> bool:
+        """
+        Whether a thread is new, or has new replies since it has been archived.
+        """
+        known = self.state["threads"].get(message["ts"])
+        return known is None or known["latest_reply"] != message.get("latest_reply")
+
+    @staticmethod
+    def title(message: t.Dict[str, t.Any]) -> str:
+        """
+        Derive a thread title from the first line of its parent message.
+        """
+        lines = message.get("text", "").strip().splitlines()
+        return lines[0][:80] if lines else ""
+
+    def link(self, ts: str) -> str:
+        return f"https://slack.com/archives/{self.channel_id}/p{ts.replace('.', '')}"
+
+    def archive(self) -> t.Dict[str, int]:
+        """
+        Export new and changed threads, and update the state and the index file.
+
+        :return: Number of threads inspected, exported, and failed
+        """
+        latest_ts = self.state["latest_ts"]
+        # Retry threads which failed to export on previous runs.
+        pending = dict(self.state["failed"])
+        inspected = 0
+        for message in self.history():
+            inspected += 1
+            if latest_ts is None or float(message["ts"]) > float(latest_ts):
+                latest_ts = message["ts"]
+            if message.get("reply_count") and self.is_changed(message):
+                pending[message["ts"]] = message
+        logger.info(f"Found {len(pending)} new, changed, or failed threads in {inspected} messages")
+
+        summary = self.exporter.export_threads(
+            [self.link(ts) for ts in pending],
+            output_dir=self.output_dir,
+            filenames=[f"{ts}.md" for ts in pending],
+        )
+        failed = {}
+        for (ts, message), result in zip(pending.items(), summary.results):
+            if not result.success:
+                failed[ts] = {
+                    "ts": ts,
+                    "text": message.get("text", ""),
+                    "latest_reply": message.get("latest_reply"),
+                    "reply_count": message.get("reply_count"),
+                }
+                continue
+            self.state["threads"][ts] = {
+                "latest_reply": message.get("latest_reply"),
+                "reply_count": message.get("reply_count"),
+                "title": self.title(message),
+                "path": os.path.relpath(t.cast(str, result.path), self.output_dir),
+            }
+
+        self.state["failed"] = failed
+        self.state["latest_ts"] = latest_ts
+        self.save()
+        self.write_index()
+        return {
+            "inspected": inspected,
+            "exported": len(pending) - len(failed),
+            "failed": len(failed),
+        }
+
+    def write_index(self) -> None:
+        """
+        Write an index of all archived threads, most recent first.
+        """
+        lines = [f"# Archive of channel {self.channel}", ""]
+        for ts, thread in sorted(
+            self.state["threads"].items(), key=lambda item: float(item[0]), reverse=True
+        ):
+            date = datetime.fromtimestamp(float(ts)).strftime("%Y-%m-%d %H:%M")
+            title = sanitize_title(thread["title"]) or "Untitled"
+            path = quote(thread["path"])
+            lines.append(f"- {date}: [{title}]({path}) ({thread['reply_count']} replies)")
+        with open(self.index_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
@@ -1,8 +1,12 @@
 import logging
+import sys
+import typing as t
 
 import click
+from slack_sdk.errors import SlackApiError
 
 from pueblo_goof.slack.model import slack_api_token_option
+from rapporto.source.slack.archive import SlackChannelArchiver
 from rapporto.source.slack.core import SlackThreadExporter
 
 logger = logging.getLogger(__name__)
@@ -22,12 +26,127 @@ def cli(ctx: click.Context, slack_token: str):
     ctx.meta.update({"slack_token": slack_token})
 
 
+concurrency_option = click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    required=False,
+    default=4,
+    help="Number of threads to export and files to download concurrently. Default: 4",
+)
+chunk_size_option = click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1024),
+    required=False,
+    default=1024 * 1024,
+    help="Size of chunks in bytes when downloading files. Default: 1 MiB",
+)
+
+
+def read_urls(urls: t.Iterable[str], file: t.Optional[t.TextIO] = None) -> t.List[str]:
+    """
+    Collect URLs from arguments and from a file, where `-` reads from stdin.
+
+    Blank lines and lines starting with `#` are ignored, and duplicates are removed.
+    """
+    lines: t.List[str] = []
+    for url in urls:
+        if url == "-":
+            lines += sys.stdin.read().splitlines()
+        else:
+            lines.append(url)
+    if file is not None:
+        lines += file.read().splitlines()
+    lines = [line.strip() for line in lines]
+    return list(dict.fromkeys(line for line in lines if line and not line.startswith("#")))
+
+
 @cli.command()
-@click.argument("url", type=str, required=True)
+@click.argument("urls", type=str, nargs=-1)
+@click.option(
+    "--file",
+    type=click.File("r"),
+    required=False,
+    help="File with Slack thread URLs, one per line. Use `-` to read from stdin.",
+)
+@concurrency_option
+@chunk_size_option
 @click.pass_context
-def export(ctx: click.Context, url: str):
+def export(
+    ctx: click.Context,
+    urls: t.Tuple[str, ...],
+    file: t.Optional[t.TextIO],
+    concurrency: int,
+    chunk_size: int,
+):
     """
-    Export a Slack thread into Markdown format.
+    Export Slack threads into Markdown format.
+
+    Accepts URLs as arguments, from a file, or from stdin using `-`.
+    Exits with a non-zero status when exporting any of the threads failed.
     """
-    exporter = SlackThreadExporter(ctx.meta["slack_token"])
-    exporter.export_thread(url)
+    links = read_urls(urls, file)
+    if not links:
+        raise click.UsageError("Missing Slack thread URL, either as argument or per `--file`.")
+    exporter = SlackThreadExporter(
+        ctx.meta["slack_token"], concurrency=concurrency, chunk_size=chunk_size
+    )
+    summary = exporter.export_threads(links)
+    if summary.failed:
+        failed = ", ".join(result.url for result in summary.failed)
+        raise click.ClickException(
+            f"Failed to export {len(summary.failed)} of {len(summary.results)} threads: {failed}"
+        )
+
+
+@cli.command()
+@click.argument("channel", type=str, required=True)
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False),
+    required=False,
+    default="slack_archive",
+    help="Directory to store the archive. Default: slack_archive",
+)
+@click.option(
+    "--lookback-days",
+    type=click.IntRange(min=0),
+    required=False,
+    default=7,
+    help="Number of days before the most recent archived message to inspect for "
+    "new replies. New replies to older threads are not discovered. Default: 7",
+)
+@concurrency_option
+@chunk_size_option
+@click.pass_context
+def archive(
+    ctx: click.Context,
+    channel: str,
+    output: str,
+    lookback_days: int,
+    concurrency: int,
+    chunk_size: int,
+):
+    """
+    Incrementally archive all threads of a Slack channel into Markdown format.
+
+    Accepts a channel name or a channel ID. Threads are only inspected for new
+    replies within the lookback period, see `--lookback-days`.
+    """
+    exporter = SlackThreadExporter(
+        ctx.meta["slack_token"], concurrency=concurrency, chunk_size=chunk_size
+    )
+    try:
+        archiver = SlackChannelArchiver(
+            exporter, channel=channel, output_dir=output, lookback_days=lookback_days
+        )
+    except KeyError as ex:
+        raise click.UsageError(ex.args[0]) from ex
+    except ValueError as ex:
+        raise click.UsageError(str(ex)) from ex
+    except SlackApiError as ex:
+        raise click.ClickException(f"Resolving channel failed: {ex.response['error']}") from ex
+    outcome = archiver.archive()
+    logger.info(
+        f"Archived {outcome['exported']} threads, {outcome['failed']} failed, "
+        f"inspected {outcome['inspected']} messages"
+    )
@@ -1,12 +1,21 @@
+import dataclasses
+import json
 import logging
 import os
 import re
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
 from slack_sdk import WebClient as SlackClient
 from slack_sdk.errors import SlackApiError
 
+from pueblo_goof.slack.directory import SlackUserDirectory
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,34 +24,30 @@ class SlackThreadExporter:
     Export a Slack thread and convert into Markdown format.
     """
 
-    def __init__(self, token):
+    def __init__(self, token, concurrency: int = 4, chunk_size: int = 1024 * 1024):
         self.client = SlackClient(token)
-        self.user_cache = {}
+        self.users = SlackUserDirectory(self.client)
+        self.concurrency = concurrency
+        self.downloader = SlackFileDownloader(token, concurrency=concurrency, chunk_size=chunk_size)
+        self.channel_names: t.Dict[str, str] = {}
+        self.lock = threading.Lock()
 
     def resolve_user_id(self, user_id):
         """
         Resolve a Slack user ID to a username.
 
+        Users are resolved using a persistent user directory, which is shared
+        across exports, and only looks up individual users when missing.
+
         :param user_id: Slack user ID (e.g., 'U01S5H7RRGB')
         :return: Username string (e.g., '@john.doe') or the original mention if unresolved
         """
-        if user_id in self.user_cache:
-            logger.debug(f"User ID {user_id} found in cache.")
-            return self.user_cache[user_id]
-
-        try:
-            user_info = self.client.users_info(user=user_id)
-            if user_info["ok"]:
-                username = f"@{user_info['user']['name']}"  # Using 'name' for @username format
-                self.user_cache[user_id] = username
-                logger.debug(f"Resolved user ID {user_id} to username {username}.")
-                return username
-            else:
-                logger.error(f"Failed to resolve user ID {user_id}: {user_info['error']}")
-                return f"<@{user_id}>"  # Return original mention if failed
-        except SlackApiError as e:
-            logger.error(f"Slack API error when resolving user ID {user_id}: {e.response['error']}")
-            return f"<@{user_id}>"  # Return original mention if exception occurs
+        name = self.users.resolve(user_id)
+        if name is None:
+            return f"<@{user_id}>"  # Return original mention if failed
+        username = f"@{name}"  # Using 'name' for @username format
+        logger.debug(f"Resolved user ID {user_id} to username {username}.")
+        return username
 
     def replace_user_mentions(self, text):
         """
@@ -60,42 +65,118 @@ class SlackThreadExporter:
             logger.debug(f"Replaced <@{user_id}> with **{username}**")
         return text
 
-    def export_thread(self, slack_link, output_dir="slack_export"):
+    def resolve_channel_name(self, channel_id):
+        """
+        Resolve a Slack channel ID to a channel name, caching it across exports.
+
+        The Slack API is inquired without holding the lock, so concurrent
+        lookups of the same channel may both inquire it.
+
+        :param channel_id: Slack channel ID (e.g., 'C08EF2NGZGB')
+        :return: Channel name
+        """
+        with self.lock:
+            if channel_id in self.channel_names:
+                return self.channel_names[channel_id]
+        channel_info = self.client.conversations_info(channel=channel_id)
+        with self.lock:
+            return self.channel_names.setdefault(channel_id, channel_info["channel"]["name"])
+
+    def fetch_thread(self, channel_id, thread_ts, limit=200):
+        """
+        Fetch all messages of a Slack thread, following pagination cursors.
+
+        :param channel_id: Slack channel ID
+        :param thread_ts: Thread timestamp
+        :return: List of messages, starting with the parent message
+        """
+        messages = []
+        for page in self.client.conversations_replies(
+            channel=channel_id, ts=thread_ts, limit=limit
+        ):
+            messages += page["messages"]
+        return messages
+
+    def export_threads(self, slack_links, output_dir="slack_export", filenames=None):
+        """
+        Export multiple Slack threads to markdown concurrently, and report throughput.
+
+        User and channel names are shared across all exports. Users looked up
+        individually are stored in the user directory once all exports finished.
+        Failing exports are recorded in their results, without aborting others.
+
+        :param slack_links: Slack thread URLs
+        :param output_dir: Directory to save exported files
+        :param filenames: Optional markdown filenames, in the order of the links
+        :return: Summary of export results, in the order of the links
+        """
+
+        def export(link: str, filename: t.Optional[str]) -> SlackExportResult:
+            try:
+                return self.export_thread(link, output_dir, filename=filename)
+            except Exception as ex:
+                logger.exception(f"Failed to export Slack link: {link}")
+                return SlackExportResult(url=link, error=f"Error exporting thread: {ex}")
+
+        started = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                results = list(
+                    executor.map(export, slack_links, filenames or [None] * len(slack_links))
+                )
+        finally:
+            self.users.close()
+            self.downloader.close()
+        summary = SlackExportSummary(results=results, duration=time.monotonic() - started)
+        logger.info(summary.message)
+        return summary
+
+    def export_thread(self, slack_link, output_dir="slack_export", filename=None):
         """
         Export a Slack thread to markdown.
 
         :param slack_link: Slack thread URL
         :param output_dir: Directory to save exported files
+        :param filename: Markdown filename, by default derived from channel name, title, and time
+        :return: Export result, including the error when the export failed
         """
         logger.info(f"Starting export for Slack link: {slack_link}")
+        result = SlackExportResult(url=slack_link)
+        started = time.monotonic()
 
         # Parse link to get channel and thread details
         try:
             channel_id, thread_ts = self._parse_slack_link(slack_link)
             logger.debug(f"Parsed channel ID: {channel_id}, Thread Timestamp: {thread_ts}")
         except ValueError as ve:
-            logger.error(f"Error parsing Slack link: {ve}")
-            return
+            result.error = f"Error parsing Slack link: {ve}"
+            logger.error(result.error)
+            return result
 
         # Fetch channel name
         try:
-            channel_info = self.client.conversations_info(channel=channel_id)
-            channel_name = channel_info["channel"]["name"]
+            channel_name = self.resolve_channel_name(channel_id)
             logger.debug(f"Fetched channel name: {channel_name}")
         except SlackApiError as e:
-            logger.error(f"Error fetching channel info: {e.response['error']}")
-            return
+            result.error = f"Error fetching channel info: {e.response['error']}"
+            logger.error(result.error)
+            return result
 
         # Fetch thread messages
         try:
-            thread_replies = self.client.conversations_replies(channel=channel_id, ts=thread_ts)
-            logger.debug(f"Fetched {len(thread_replies['messages'])} messages in thread.")
+            messages = self.fetch_thread(channel_id, thread_ts)
+            logger.debug(f"Fetched {len(messages)} messages in thread.")
         except SlackApiError as e:
-            logger.error(f"Error fetching thread: {e.response['error']}")
-            return
+            result.error = f"Error fetching thread: {e.response['error']}"
+            logger.error(result.error)
+            return result
+        if not messages:
+            result.error = "Error fetching thread: No messages found"
+            logger.error(result.error)
+            return result
 
         # Get the title from the first message
-        title = thread_replies["messages"][0].get("text", "")[:20]
+        title = messages[0].get("text", "")[:20]
         logger.debug(f"Extracted title from first message: {title}")
 
         # Create output directories
@@ -108,15 +189,15 @@ class SlackThreadExporter:
         sanitized_channel_name = self._sanitize_filename(channel_name)
         sanitized_title = self._sanitize_filename(title)
         sanitized_ts = datetime.fromtimestamp(float(thread_ts)).strftime("%y-%m-%d-%H_%M")
-        filename_md = f"{sanitized_channel_name}_{sanitized_title}_{sanitized_ts}.md"
+        filename_md = filename or f"{sanitized_channel_name}_{sanitized_title}_{sanitized_ts}.md"
         logger.debug(f"Generated markdown filename: {filename_md}")
 
-        # Markdown content
-        content = []
-        file_counter = 1
+        # Markdown content. File attachments are downloaded after processing all messages.
+        content: t.List[t.Union[str, SlackAttachment]] = []
+        attachments: t.List[SlackAttachment] = []
 
         # Process each message in the thread
-        for message in thread_replies["messages"]:
+        for message in messages:
             # Parse message details
             user_id = message.get("user", "")
             if user_id:
@@ -166,31 +247,27 @@ class SlackThreadExporter:
                     sanitized_filename = self._sanitize_filename(original_filename)
                     basename, extension = os.path.splitext(sanitized_filename)
 
-                    # Create unique filename with sanitized_ts and counter
-                    unique_filename = f"{basename}_{sanitized_ts}_{file_counter}{extension}"
-                    file_path = os.path.join(attachments_dir, unique_filename)
-                    logger.debug(f"Prepared to download file: {unique_filename}")
-
-                    # Download file with authorization
-                    headers = {"Authorization": f"Bearer {self.client.token}"}
-                    success = self._download_file(
-                        file_info.get("url_private_download", ""), file_path, headers
-                    )
-
-                    if success:
-                        # Add file reference to markdown
-                        if file_info.get("mimetype", "").startswith("image/"):
-                            content.append(f"![{unique_filename}](attachments/{unique_filename})")
-                            logger.debug(f"Embedded image in markdown: {unique_filename}")
-                        else:
-                            attachment_link = (
-                                f"[Download {unique_filename}](attachments/{unique_filename})"
-                            )
-                            content.append(f"**Attachment:** {attachment_link}")
-                            logger.debug(f"Added attachment link in markdown: {unique_filename}")
-                        file_counter += 1  # Increment counter after successful download
+                    # Create unique filename, because threads share the attachments directory,
+                    # using the Slack file ID, or the full thread timestamp and a counter.
+                    file_id = file_info.get("id", "")
+                    if file_id:
+                        unique_filename = f"{file_id}_{sanitized_filename}"
                     else:
-                        logger.error(f"Failed to download file: {unique_filename}")
+                        unique_ts = thread_ts.replace(".", "")
+                        unique_filename = (
+                            f"{basename}_{unique_ts}_{len(attachments) + 1}{extension}"
+                        )
+                    attachment = SlackAttachment(
+                        url=file_info.get("url_private_download", ""),
+                        path=os.path.join(attachments_dir, unique_filename),
+                        size=file_info.get("size"),
+                        mimetype=file_info.get("mimetype", ""),
+                        file_id=file_id,
+                        created=file_info.get("created"),
+                    )
+                    logger.debug(f"Prepared to download file: {unique_filename}")
+                    attachments.append(attachment)
+                    content.append(attachment)
 
             # Handle reactions
             if "reactions" in message:
@@ -216,8 +293,19 @@ class SlackThreadExporter:
             content.append("\n---\n")
             logger.debug("Added section separator to markdown.")
 
+        # Download file attachments, and reference them in markdown
+        downloaded = set(self.downloader.download(attachments))
+        blocks = []
+        for item in content:
+            if isinstance(item, SlackAttachment):
+                if item not in downloaded:
+                    logger.error(f"Failed to download file: {item.filename}")
+                    continue
+                item = item.markdown
+            blocks.append(item)
+
         # Write markdown file
-        markdown_text = "\n".join(content)
+        markdown_text = "\n".join(blocks)
         markdown_file_path = os.path.join(output_dir, filename_md)
         logger.info(f"Writing markdown file to: {markdown_file_path}")
         try:
@@ -225,9 +313,16 @@ class SlackThreadExporter:
                 f.write(markdown_text)
             logger.info(f"Markdown file written successfully to: {markdown_file_path}")
         except Exception as e:
-            logger.error(f"Error writing markdown file: {e}")
-
+            result.error = f"Error writing markdown file: {e}"
+            logger.error(result.error)
+            return result
+
+        result.path = markdown_file_path
+        result.messages = len(messages)
+        result.files = len(downloaded)
+        result.duration = time.monotonic() - started
         logger.info(f"Thread exported successfully to {output_dir}")
+        return result
 
     def _format_opsgenie_message(self, text):
         """
@@ -273,44 +368,213 @@ class SlackThreadExporter:
         logger.debug(f"Sanitized filename from '{filename}' to '{sanitized}'")
         return sanitized
 
-    def _download_file(self, url, path, headers):
+
+@dataclasses.dataclass
+class SlackExportResult:
+    """
+    Outcome of exporting a single Slack thread.
+    """
+
+    url: str
+    path: t.Optional[str] = None
+    messages: int = 0
+    files: int = 0
+    duration: float = 0.0
+    error: t.Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass
+class SlackExportSummary:
+    """
+    Aggregate outcomes and throughput of exporting multiple Slack threads.
+    """
+
+    results: t.List[SlackExportResult]
+    duration: float
+
+    @property
+    def failed(self) -> t.List[SlackExportResult]:
+        return [result for result in self.results if not result.success]
+
+    @property
+    def message(self) -> str:
+        succeeded = [result for result in self.results if result.success]
+        messages = sum(result.messages for result in succeeded)
+        files = sum(result.files for result in succeeded)
+        rate = len(succeeded) / self.duration if self.duration else 0.0
+        return (
+            f"Exported {len(succeeded)} of {len(self.results)} threads, "
+            f"{messages} messages, and {files} files in {self.duration:.1f}s "
+            f"({rate:.2f} threads/s)"
+        )
+
+
+@dataclasses.dataclass(frozen=True)
+class SlackAttachment:
+    """
+    A file attached to a Slack message, and its designated download location.
+    """
+
+    url: str
+    path: str
+    size: t.Optional[int] = None
+    mimetype: str = ""
+    file_id: str = ""
+    created: t.Optional[int] = None
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def manifest(self) -> t.Dict[str, t.Any]:
+        """
+        Identify the file, to detect when a different file is stored at the same path.
+        """
+        return {"id": self.file_id, "created": self.created, "size": self.size}
+
+    @property
+    def markdown(self) -> str:
+        """
+        Reference the file in markdown, embedding images.
+        """
+        if self.mimetype.startswith("image/"):
+            return f"![{self.filename}](attachments/{self.filename})"
+        return f"**Attachment:** [Download {self.filename}](attachments/{self.filename})"
+
+
+class SlackFileDownloader:
+    """
+    Download file attachments concurrently, using a pool of keep-alive HTTP connections.
+
+    All downloads share a single pool of `concurrency` workers, also when invoked
+    from multiple threads, matching the number of pooled HTTP connections.
+
+    Files already present are skipped, when their size and their manifest match,
+    i.e. the Slack file ID and creation time, stored in a `.json` file next to
+    them. Interrupted downloads are kept as `.part` files, and resumed using HTTP
+    range requests.
+    """
+
+    def __init__(
+        self, token, concurrency: int = 4, chunk_size: int = 1024 * 1024, timeout: float = 10.0
+    ):
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {token}"
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.executor: t.Optional[ThreadPoolExecutor] = None
+        self.lock = threading.Lock()
+
+    def download(self, attachments: t.List[SlackAttachment]) -> t.List[SlackAttachment]:
+        """
+        Download multiple files, and return the ones which succeeded.
+        """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+            executor = self.executor
+        results = list(executor.map(self.fetch, attachments))
+        return [attachment for attachment, success in zip(attachments, results) if success]
+
+    def close(self) -> None:
+        """
+        Shut down the pool of download workers.
+        """
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+    @staticmethod
+    def read_manifest(attachment: SlackAttachment) -> t.Optional[t.Dict[str, t.Any]]:
+        try:
+            with open(f"{attachment.path}.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def write_manifest(attachment: SlackAttachment) -> None:
+        with open(f"{attachment.path}.json", "w", encoding="utf-8") as f:
+            json.dump(attachment.manifest, f)
+
+    def fetch(self, attachment: SlackAttachment) -> bool:
         """
-        Download file from URL with authorization headers.
+        Download a single file.
 
-        :param url: File URL
-        :param path: Path to save the file
-        :param headers: Authorization headers
+        :param attachment: File URL, path to save the file, and its expected size
         :return: Boolean indicating success or failure
         """
-        if not url:
+        if not attachment.url:
             logger.error("No download URL provided.")
             return False
 
+        path = attachment.path
+        partial = f"{path}.part"
         try:
-            logger.info(f"Attempting to download file from URL: {url}")
-            response = requests.get(url, headers=headers, stream=True, timeout=10.0)
+            if self.read_manifest(attachment) == attachment.manifest:
+                if os.path.exists(path) and attachment.size in (None, os.path.getsize(path)):
+                    logger.info(f"File already downloaded: {path}")
+                    return True
+            else:
+                # Discard files of another download, and designate the current one.
+                for stale in (path, partial):
+                    if os.path.exists(stale):
+                        os.remove(stale)
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                self.write_manifest(attachment)
+
+            offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+            headers = {}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+
+            logger.info(f"Attempting to download file from URL: {attachment.url}")
+            response = self.session.get(
+                attachment.url, headers=headers, stream=True, timeout=self.timeout
+            )
             logger.debug(f"Response Status Code: {response.status_code}")
             logger.debug(f"Response Headers: {response.headers}")
 
-            if response.status_code == 200:
-                content_type = response.headers.get("Content-Type", "").lower()
-                # logger.debug(f"Content-Type of response: {content_type}")
+            if response.status_code == 416 and offset == attachment.size:
+                # The partial download is complete already.
+                mode = None
+            elif response.status_code == 206 and offset:
+                logger.info(f"Resuming download at offset {offset}: {path}")
+                mode = "ab"
+            elif response.status_code == 200:
+                mode = "wb"
+            else:
+                logger.error(f"Failed to download file. Status Code: {response.status_code}")
+                return False
 
-                if "text/html" in content_type:
-                    logger.error(
-                        f"Unexpected Content-Type: {content_type}. Possible authentication issue."
-                    )
-                    return False
+            content_type = response.headers.get("Content-Type", "").lower()
+            if mode and "text/html" in content_type:
+                logger.error(
+                    f"Unexpected Content-Type: {content_type}. Possible authentication issue."
+                )
+                return False
 
-                with open(path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
+            if mode:
+                with open(partial, mode) as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
                         if chunk:
                             f.write(chunk)
-                logger.info(f"File downloaded successfully: {path}")
-                return True
-            else:
-                logger.error(f"Failed to download file. Status Code: {response.status_code}")
+
+            if attachment.size is not None and os.path.getsize(partial) != attachment.size:
+                logger.error(f"Download incomplete, keeping partial file: {partial}")
                 return False
+            os.replace(partial, path)
+            logger.info(f"File downloaded successfully: {path}")
+            return True
         except Exception as e:
             logger.error(f"Exception occurred while downloading file: {e}")
             return False
@@ -1,10 +1,14 @@
 import datetime as dt
+import importlib
 import logging
 import sys
 import typing as t
+from pathlib import Path
 
-from aika import TimeIntervalParser
-from markdown_to_mrkdwn import SlackMarkdownConverter
+import click
+from click_aliases import ClickAliasedGroup
+
+from pueblo_goof.util import cache_path as goof_cache_path
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +33,8 @@ def to_mrkdwn(markdown: str, unordered_list: bool = True) -> str:
     """
     Convert standard Markdown to Slack `mrkdwn` format.
     """
+    from markdown_to_mrkdwn import SlackMarkdownConverter
+
     mrkdwn_converter = SlackMarkdownConverter()
     try:
         # Unordered list
@@ -39,6 +45,15 @@ def to_mrkdwn(markdown: str, unordered_list: bool = True) -> str:
     return mrkdwn_converter.convert(markdown)
 
 
+def cache_path() -> Path:
+    """
+    Return the directory for cache files, by default the user cache directory.
+
+    Use the `RAPPORTO_CACHE_DIR` environment variable to override it.
+    """
+    return goof_cache_path(envvar="RAPPORTO_CACHE_DIR", appname="rapporto")
+
+
 def setup_logging(level=logging.INFO, verbose: bool = False):
     """
     Configure Python's logging module.
@@ -54,6 +69,8 @@ def week_to_day_range(when: str, skip_the_future: bool = True) -> t.List[str]:
     TODO: Refactor to Aika.
     TODO: Make it configurable whether to return 7 or 8 days.
     """
+    from aika import TimeIntervalParser
+
     week = []
     today = dt.date.today()
     tip = TimeIntervalParser()
@@ -66,3 +83,38 @@ def week_to_day_range(when: str, skip_the_future: bool = True) -> t.List[str]:
             logger.info(f"Skipping day in the future: {cursor.date().isoformat()}.")
             break
     return week
+
+
+class LazyAliasedGroup(ClickAliasedGroup):
+    """
+    A command group with aliases, importing subcommands only when they are invoked.
+
+    Subcommands are registered using import paths like `package.module:attribute`,
+    so the program starts quickly, without importing all subsystems upfront.
+    """
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands: t.Dict[str, str] = {}
+
+    def add_lazy_command(
+        self, import_path: str, name: str, aliases: t.Optional[t.List[str]] = None
+    ) -> None:
+        self.lazy_commands[name] = import_path
+        if aliases:
+            self._commands[name] = aliases
+            for alias in aliases:
+                self._aliases[alias] = name
+
+    def list_commands(self, ctx: click.Context) -> t.List[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_commands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> t.Optional[click.Command]:
+        cmd_name = self.resolve_alias(cmd_name)
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            module_name, attribute = self.lazy_commands[cmd_name].split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            if not isinstance(command, click.Command):
+                raise TypeError(f"Lazy command is not a click command: {cmd_name}")
+            self.commands[cmd_name] = command
+        return super().get_command(ctx, cmd_name)
@@ -0,0 +1,105 @@
+import io
+
+import pytest
+import requests
+from urllib3 import HTTPResponse
+
+from rapporto.cache.core import HttpCache, endpoint, parse_duration
+from rapporto.cli import cli
+from rapporto.source.github.util import GitHubCacheStatistics, GitHubHttpOptions
+
+
+def make_response(url: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.request = requests.Request("GET", url).prepare()
+    response.raw = HTTPResponse(body=io.BytesIO(), status=200, request_url=url)
+    response._content = b"{}"
+    return response
+
+
+@pytest.fixture
+def http_cache() -> HttpCache:
+    cache = HttpCache()
+    cache.backend.save_response(make_response("https://api.github.com/repos/acme/foo/pulls/1"))
+    cache.backend.save_response(make_response("https://api.github.com/repos/acme/bar/pulls/2"))
+    cache.backend.save_response(make_response("https://api.github.com/search/issues?q=foo"))
+    yield cache
+    cache.backend.clear()
+
+
+def test_parse_duration():
+    assert parse_duration("90").total_seconds() == 90
+    assert parse_duration("12h").total_seconds() == 12 * 3600
+    assert parse_duration("7d").days == 7
+    with pytest.raises(ValueError):
+        parse_duration("foo")
+
+
+def test_endpoint():
+    assert endpoint("https://api.github.com/repos/acme/foo/pulls/42") == (
+        "api.github.com/repos/*/*/pulls"
+    )
+    assert endpoint("https://api.github.com/search/issues?q=foo") == "api.github.com/search/issues"
+
+
+def test_cli_cache_stats(cli_runner, http_cache):
+    """
+    CLI test: Invoke `rapporto cache stats`.
+    """
+    counter = GitHubCacheStatistics()
+    counter.counter.update(hit=3, miss=1)
+    counter.save(GitHubHttpOptions().statistics_path)
+
+    result = cli_runner.invoke(
+        cli,
+        args="cache stats",
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert "responses: 3" in result.output
+    assert "api.github.com/repos/*/*/pulls: 2" in result.output
+    assert "hit=3, revalidated=0, miss=1, ratio=75%" in result.output
+    GitHubHttpOptions().statistics_path.unlink()
+
+
+def test_cli_cache_purge(cli_runner, http_cache):
+    """
+    CLI test: Invoke `rapporto cache purge`.
+    """
+    result = cli_runner.invoke(
+        cli,
+        args="cache purge --older-than=1d",
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert "Purged 0 responses" in result.output
+
+    result = cli_runner.invoke(
+        cli,
+        args="cache purge",
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 2
+    assert "Use `--older-than`, `--expired`, or `--all`" in result.output
+
+    result = cli_runner.invoke(
+        cli,
+        args="cache purge --all",
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert "Purged 3 responses" in result.output
+
+
+def test_cli_cache_vacuum(cli_runner, http_cache):
+    """
+    CLI test: Invoke `rapporto cache vacuum`.
+    """
+    result = cli_runner.invoke(
+        cli,
+        args="cache vacuum",
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
@@ -1,6 +1,8 @@
 import os
+import typing as t
 
 import pytest
+import requests
 from click.testing import CliRunner
 
 
@@ -10,7 +12,43 @@ def cli_runner() -> CliRunner:
 
 
 @pytest.fixture(autouse=True)
-def reset_environment(monkeypatch):
+def reset_environment(monkeypatch, tmp_path_factory):
+    monkeypatch.setenv("RAPPORTO_CACHE_DIR", str(tmp_path_factory.getbasetemp() / "cache"))
+    monkeypatch.setenv("GOOF_CACHE_DIR", str(tmp_path_factory.getbasetemp() / "goof"))
     monkeypatch.delenv("GH_TOKEN", raising=False)
     if "GH_TOKEN_TEST" in os.environ:
         monkeypatch.setenv("GH_TOKEN", os.getenv("GH_TOKEN_TEST"))
+
+
+class FakeResponse:
+    """
+    An HTTP response, like `requests.Response`, serving JSON data or binary content.
+    """
+
+    def __init__(
+        self,
+        data: t.Optional[t.Any] = None,
+        status_code: int = 200,
+        links: t.Optional[t.Dict[str, t.Dict[str, str]]] = None,
+        content: bytes = b"",
+    ):
+        self.data = data if data is not None else {}
+        self.status_code = status_code
+        self.links = links or {}
+        self.content = content
+        self.headers = {"Content-Type": "application/octet-stream"}
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)  # type: ignore[arg-type]
+
+    def iter_content(self, chunk_size: int) -> t.Iterator[bytes]:
+        for index in range(0, len(self.content), chunk_size):
+            yield self.content[index : index + chunk_size]
@@ -0,0 +1,212 @@
+import time
+import typing as t
+
+from munch import munchify
+
+from rapporto.source.github.actions import (
+    ActionsFilter,
+    ActionsOutcome,
+    GitHubActionsReport,
+    GitHubActionsRequest,
+)
+from rapporto.source.github.model import GitHubMultiRepositoryInquiry
+from rapporto.source.github.util import GitHubRateLimitExceeded
+from tests.conftest import FakeResponse
+
+
+class FakeSession:
+    """
+    Respond with one workflow run per repository, slower for earlier repositories.
+    """
+
+    def __init__(self, repositories):
+        self.repositories = repositories
+
+    def get(self, url: str):
+        repository = url.split("/repos/")[1].split("/actions")[0]
+        if repository not in self.repositories:
+            return FakeResponse(status_code=404)
+        time.sleep(0.01 * (len(self.repositories) - self.repositories.index(repository)))
+        run = {
+            "id": self.repositories.index(repository),
+            "event": "push",
+            "status": "completed",
+            "conclusion": "failure",
+            "repository": {"full_name": repository},
+            "display_title": "Tests",
+            "html_url": f"https://github.com/{repository}/actions/runs/1",
+            "created_at": "2025-03-03T10:00:00Z",
+            "run_started_at": "2025-03-03T10:00:00Z",
+            "head_branch": "main",
+        }
+        return FakeResponse(data={"workflow_runs": [run]})
+
+
+def test_fetch_concurrent_order():
+    """
+    Concurrent fetching keeps the order of repositories, and skips unknown ones.
+    """
+    repositories = ["acme/foo", "acme/bar", "acme/unknown", "acme/baz"]
+    inquiry = GitHubMultiRepositoryInquiry(repositories=repositories, concurrency=4)
+    request = GitHubActionsRequest(inquiry)
+    request.session = FakeSession(["acme/foo", "acme/bar", "acme/baz"])
+    outcomes = list(request.fetch(filter=ActionsFilter(status="failure")))
+    assert [outcome.repository.full_name for outcome in outcomes] == [
+        "acme/foo",
+        "acme/bar",
+        "acme/baz",
+    ]
+
+
+def test_single_pass():
+    """
+    Failed runs and successful PR runs are derived from a single request per repository.
+    """
+
+    class CountingSession(FakeSession):
+        calls = 0
+
+        def get(self, url: str):
+            self.calls += 1
+            return super().get(url)
+
+    repositories = ["acme/foo", "acme/bar"]
+    inquiry = GitHubMultiRepositoryInquiry(repositories=repositories, created="2025-03-03")
+    request = GitHubActionsRequest(inquiry)
+    request.session = CountingSession(repositories)
+    assert len(request.runs_failed) == 2
+    assert len(request.runs_pr_success) == 0
+    assert request.session.calls == 2
+
+
+def test_filter_matches():
+    outcome = make_outcome(event="pull_request", conclusion="success")
+    assert ActionsFilter(event="pull_request", status="success").matches(outcome)
+    assert ActionsFilter(status="completed").matches(outcome)
+    assert not ActionsFilter(status="failure").matches(outcome)
+    assert not ActionsFilter(event="push").matches(outcome)
+
+
+def test_pr_success_afterwards():
+    """
+    Failed PR runs are only suppressed when the same workflow succeeded afterward.
+    """
+    fixed = make_outcome(event="pull_request", head_branch="fixed", started="2025-03-03T10:00:00Z")
+    broken = make_outcome(
+        event="pull_request", head_branch="broken", started="2025-03-03T10:00:00Z"
+    )
+    report = GitHubActionsReport.__new__(GitHubActionsReport)
+    report.runs_failed = [fixed, broken, fixed]
+    report.pr_success_index = GitHubActionsReport.index_runs(
+        [
+            make_outcome(
+                event="pull_request",
+                conclusion="success",
+                head_branch="fixed",
+                started="2025-03-03T11:00:00Z",
+            ),
+            make_outcome(
+                event="pull_request",
+                conclusion="success",
+                head_branch="broken",
+                started="2025-03-03T09:00:00Z",
+            ),
+        ]
+    )
+    assert list(report.runs) == [broken]
+
+
+def test_pagination_stops_early():
+    """
+    All pages are fetched, until reaching runs older than the time interval.
+    """
+
+    def run(identifier: int, created_at: str):
+        return {
+            "id": identifier,
+            "event": "push",
+            "status": "completed",
+            "conclusion": "failure",
+            "repository": {"full_name": "acme/foo"},
+            "display_title": f"Tests {identifier}",
+            "html_url": f"https://github.com/acme/foo/actions/runs/{identifier}",
+            "created_at": created_at,
+            "run_started_at": created_at,
+            "head_branch": "main",
+        }
+
+    class PagingSession:
+        urls: t.ClassVar[t.List[str]] = []
+        pages: t.ClassVar[t.Dict[str, FakeResponse]] = {
+            "first": FakeResponse(
+                data={"workflow_runs": [run(1, "2025-03-04T10:00:00Z")]},
+                links={"next": {"url": "second"}},
+            ),
+            "second": FakeResponse(
+                data={
+                    "workflow_runs": [
+                        run(2, "2025-03-03T23:00:00Z"),
+                        run(3, "2025-03-02T10:00:00Z"),
+                    ]
+                },
+                links={"next": {"url": "third"}},
+            ),
+        }
+
+        def get(self, url: str):
+            self.urls.append(url)
+            return self.pages.get(url, self.pages["first"])
+
+    inquiry = GitHubMultiRepositoryInquiry(repositories=["acme/foo"], concurrency=1)
+    request = GitHubActionsRequest(inquiry)
+    request.session = PagingSession()
+    outcomes = list(request.fetch(filter=ActionsFilter(created="2025-03-03..2025-03-04")))
+    assert [outcome.id for outcome in outcomes] == [1, 2]
+    assert len(request.session.urls) == 2
+
+
+def test_rate_limit_incomplete():
+    """
+    Repositories skipped because of an exhausted rate limit are marked as incomplete.
+    """
+
+    class LimitedSession(FakeSession):
+        def get(self, url: str):
+            if "acme/bar" in url:
+                raise GitHubRateLimitExceeded("Rate limit for core exhausted")
+            return super().get(url)
+
+    repositories = ["acme/foo", "acme/bar"]
+    inquiry = GitHubMultiRepositoryInquiry(repositories=repositories, created="2025-03-03")
+    report = GitHubActionsReport.__new__(GitHubActionsReport)
+    report.request = GitHubActionsRequest(inquiry)
+    report.request.session = LimitedSession(repositories)
+    assert len(report.request.runs) == 1
+    assert report.incomplete == [
+        "Workflow runs of acme/bar are incomplete: Rate limit for core exhausted"
+    ]
+
+    report = GitHubActionsReport(inquiry, runs=[], incomplete=report.incomplete)
+    assert "> **Incomplete:** This report is missing information from GitHub." in report.markdown
+    assert "> - Workflow runs of acme/bar are incomplete" in report.markdown
+
+
+def make_outcome(
+    event: str = "push",
+    conclusion: str = "failure",
+    repository: str = "acme/foo",
+    head_branch: str = "main",
+    name: str = "Tests",
+    started: str = "2025-03-03T10:00:00Z",
+) -> ActionsOutcome:
+    return ActionsOutcome(
+        id=42,
+        event=event,
+        status="completed",
+        conclusion=conclusion,
+        repository=munchify({"full_name": repository}),
+        name=name,
+        url=f"https://github.com/{repository}/actions/runs/42",
+        started=started,
+        head_branch=head_branch,
+    )
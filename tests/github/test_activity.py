@@ -0,0 +1,65 @@
+from fractions import Fraction
+
+import pytest
+
+from rapporto.source.github.activity import GitHubSignificantPullRequests, PullRequestMetadata
+
+
+def make_pull_request(number: int, additions: int, changed_files: int, comments: int):
+    return PullRequestMetadata.from_dict(
+        {
+            "number": number,
+            "url": f"https://api.github.com/repos/acme/foo/pulls/{number}",
+            "html_url": f"https://github.com/acme/foo/pull/{number}",
+            "title": f"Change {number}",
+            "commits": 1,
+            "additions": additions,
+            "deletions": 0,
+            "changed_files": changed_files,
+            "comments": comments,
+            "review_comments": 0,
+            "base": {"repo": {"name": "foo"}},
+        }
+    )
+
+
+class StaticPullRequests(GitHubSignificantPullRequests):
+    def items(self):
+        return [
+            make_pull_request(1, additions=500, changed_files=10, comments=0),
+            make_pull_request(2, additions=10, changed_files=1, comments=20),
+            make_pull_request(3, additions=400, changed_files=5, comments=15),
+            make_pull_request(4, additions=1, changed_files=1, comments=1),
+            make_pull_request(5, additions=2, changed_files=1, comments=2),
+        ]
+
+
+def test_significant_default_share():
+    """
+    By default, select the top item of each ranking, deduplicated.
+    """
+    items = StaticPullRequests(session=None, search=None).significant()
+    assert [item.number for item in items] == ["1", "2"]
+
+
+def test_significant_custom_share():
+    """
+    Share and rankings are configurable.
+    """
+    items = StaticPullRequests(session=None, search=None, share="2/5").significant()
+    assert [item.number for item in items] == ["1", "3", "2", "5"]
+
+    significant = StaticPullRequests(
+        session=None, search=None, share=0.2, rankings=[["comments_total"]]
+    )
+    assert significant.share == Fraction(1, 5)
+    assert [item.number for item in significant.significant()] == ["2", "3"]
+
+
+@pytest.mark.parametrize("share", ["-1/2", "0", "3/2", 1.5])
+def test_significant_invalid_share(share):
+    """
+    Shares outside the interval (0, 1] are rejected.
+    """
+    with pytest.raises(ValueError):
+        StaticPullRequests(session=None, search=None, share=share)
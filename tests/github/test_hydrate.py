@@ -0,0 +1,115 @@
+import threading
+import time
+
+from rapporto.source.github.activity import PullRequestMetadata
+from rapporto.source.github.hydrate import GitHubGraphQLHydrator, GitHubRestHydrator
+from rapporto.source.github.model import QKind
+from tests.conftest import FakeResponse
+
+
+class GraphQLSession:
+    """
+    Respond to GraphQL `nodes` queries with pull request nodes.
+    """
+
+    def __init__(self):
+        self.requests = 0
+
+    def post(self, url, json):
+        self.requests += 1
+        nodes = []
+        for node_id in json["variables"]["ids"]:
+            number = int(node_id.split("_")[1])
+            nodes.append(
+                {
+                    "id": node_id,
+                    "number": number,
+                    "title": f"Change {number}",
+                    "additions": 10 * number,
+                    "deletions": number,
+                    "changedFiles": 2,
+                    "commits": {"totalCount": 1},
+                    "comments": {"totalCount": 3},
+                    "reviews": {"nodes": [{"comments": {"totalCount": 2}}]},
+                    "baseRepository": {"name": "foo"},
+                }
+            )
+        return FakeResponse({"data": {"nodes": nodes}})
+
+
+def test_graphql_hydrate_pulls():
+    """
+    Pull requests are hydrated in batches, and can be decoded into metadata objects.
+    """
+    items = [
+        {
+            "node_id": f"PR_{number}",
+            "html_url": f"https://github.com/acme/foo/pull/{number}",
+            "pull_request": {"url": f"https://api.github.com/repos/acme/foo/pulls/{number}"},
+        }
+        for number in range(1, 151)
+    ]
+    session = GraphQLSession()
+    records = GitHubGraphQLHydrator(session).hydrate(items, kind=QKind.PULLREQUEST)
+    assert session.requests == 2
+    assert len(records) == 150
+
+    metadata = PullRequestMetadata.from_dict(records[41])
+    assert metadata.number == "42"
+    assert metadata.code_size == 378
+    assert metadata.comments_total == 5
+    assert metadata.repo_name == "foo"
+
+
+def test_rest_hydrate_concurrent_order():
+    """
+    Concurrent REST requests keep the order of items.
+    """
+
+    class RestSession:
+        def get(self, url):
+            number = int(url.rsplit("/", 1)[1])
+            time.sleep(0.001 * (20 - number))
+            return FakeResponse({"number": number})
+
+    items = [
+        {"url": f"https://api.github.com/repos/acme/foo/issues/{number}"} for number in range(20)
+    ]
+    hydrator = GitHubRestHydrator(RestSession(), concurrency=8, per_host=4)
+    records = hydrator.hydrate(items, decode_url=lambda item: item["url"])
+    assert [record["number"] for record in records] == list(range(20))
+
+
+def test_rest_hydrate_per_host_limit():
+    """
+    Concurrent REST requests per host are limited independently of the number of workers.
+    """
+
+    class RestSession:
+        def __init__(self):
+            self.active = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+
+        def get(self, url):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.005)
+            with self.lock:
+                self.active -= 1
+            return FakeResponse({"number": int(url.rsplit("/", 1)[1])})
+
+    items = [
+        {"url": f"https://api.github.com/repos/acme/foo/issues/{number}"} for number in range(12)
+    ]
+    session = RestSession()
+    hydrator = GitHubRestHydrator(session, concurrency=6)  # type: ignore[arg-type]
+    assert len(hydrator.hydrate(items, decode_url=lambda item: item["url"])) == 12
+    assert session.peak <= 2
+
+    # The pool of workers is sized to the per-host limit across all hosts.
+    urls = [item["url"] for item in items]
+    assert hydrator.workers(urls) == 2
+    assert hydrator.workers([*urls, "https://github.example.org/api/v3/issues/1"]) == 4
+    assert GitHubRestHydrator(session, concurrency=3).workers(urls * 2 + ["https://a/1"]) == 3
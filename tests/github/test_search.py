@@ -0,0 +1,108 @@
+import datetime as dt
+import re
+import typing as t
+import urllib.parse
+
+from rapporto.source.github.model import (
+    GitHubInquiry,
+    GitHubQueryBuilder,
+    GitHubSearch,
+    GitHubSearchPlanner,
+    GitHubTimeInterval,
+    QKind,
+)
+from tests.conftest import FakeResponse
+
+
+class PagingSession:
+    """
+    Serve search results in pages of two items, per kind of item.
+    """
+
+    def __init__(self, issues: int, pulls: int):
+        self.results = {"issue": issues, "pr": pulls}
+
+    def get(self, url: str):
+        kind = "pr" if "is%3Apr" in url else "issue"
+        page = int(url.split("&page=")[1]) if "&page=" in url else 1
+        total = self.results[kind]
+        items = [
+            {"html_url": f"https://github.com/acme/foo/{kind}/{number}"}
+            for number in range((page - 1) * 2 + 1, min(page * 2, total) + 1)
+        ]
+        links = {}
+        if page * 2 < total:
+            links["next"] = {"url": f"{url.split('&page=')[0]}&page={page + 1}"}
+        return FakeResponse(data={"total_count": total, "items": items}, links=links)
+
+
+class AcmeQueryBuilder(GitHubQueryBuilder):
+    def query(self):
+        self.add("org", self.inquiry.organization)
+        self.add("updated", self.timeinterval.githubformat())
+
+
+def test_issues_and_prs_paginated():
+    """
+    Issues and pull requests are enumerated across all pages.
+    """
+    inquiry = GitHubInquiry(organization="acme", updated="2025-03-01..2025-03-31")
+    search = GitHubSearch.with_query_builder(
+        PagingSession(issues=5, pulls=3), AcmeQueryBuilder(inquiry)
+    )
+    urls = [item["html_url"] for item in search.issues_and_prs()]
+    assert len(urls) == 8
+    assert urls[0] == "https://github.com/acme/foo/issue/1"
+    assert urls[-1] == "https://github.com/acme/foo/pr/3"
+
+
+class WindowedSession:
+    """
+    Serve two search results per day of the `updated:` interval, in a single page.
+    """
+
+    def __init__(self):
+        self.urls: t.List[str] = []
+
+    def get(self, url: str):
+        self.urls.append(url)
+        query = urllib.parse.unquote(url)
+        start, end = re.search(r"updated:(\S+)\.\.(\S+)", query).groups()
+        day = dt.date.fromisoformat(start[:10])
+        items = []
+        while day <= dt.date.fromisoformat(end[:10]):
+            for number in [1, 2]:
+                items.append({"html_url": f"https://github.com/acme/foo/issues/{day}-{number}"})
+            day += dt.timedelta(days=1)
+        return FakeResponse(data={"total_count": len(items), "items": items})
+
+
+class CappedSearch(GitHubSearch):
+    RESULTS_MAX = 5
+
+
+def test_search_planner_bisects():
+    """
+    Queries exceeding the results cap are split into smaller time intervals.
+    """
+    inquiry = GitHubInquiry(organization="acme", updated="2025-03-01..2025-03-08")
+    session = WindowedSession()
+    search = CappedSearch.with_query_builder(session, AcmeQueryBuilder(inquiry))
+    urls = [item["html_url"] for item in GitHubSearchPlanner(search=search).items(QKind.ISSUE)]
+    assert len(urls) == 16
+    assert len(set(urls)) == 16
+    assert urls[0] == "https://github.com/acme/foo/issues/2025-03-01-1"
+    assert urls[-1] == "https://github.com/acme/foo/issues/2025-03-08-2"
+
+
+def test_search_planner_bisect_single_day():
+    """
+    A single day is split by time of day.
+    """
+    search = GitHubSearch.with_query_builder(None, AcmeQueryBuilder(GitHubInquiry()))
+    planner = GitHubSearchPlanner(search=search)
+    halves = planner.bisect(GitHubTimeInterval(start=dt.datetime(2025, 3, 1)))
+    assert [half.githubformat() for half in halves] == [
+        "2025-03-01T00:00:00..2025-03-01T11:59:59",
+        "2025-03-01T12:00:00..2025-03-01T23:59:59",
+    ]
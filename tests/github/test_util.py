@@ -1,4 +1,20 @@
-from rapporto.source.github.util import repository_name
+import io
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from rapporto.source.github.util import (
+    GitHubCacheStatistics,
+    GitHubHttpClient,
+    GitHubHttpOptions,
+    GitHubRateLimitAdapter,
+    GitHubRateLimitExceeded,
+    GitHubRateLimitScheduler,
+    repository_name,
+)
 
 
 def test_repository_name():
@@ -13,3 +29,155 @@ def test_repository_name():
         == "tech-writing/rapporto"
     )
     assert repository_name("https://api.github.com/repos/tech-writing/rapporto") == "rapporto"
+
+
+def test_session_lazy():
+    """
+    The HTTP session is created on first use, once per process.
+    """
+    GitHubHttpClient.reset()
+    assert GitHubHttpClient._sessions == {}
+    session = GitHubHttpClient.get_session()
+    assert GitHubHttpClient.get_session() is session
+    GitHubHttpClient.reset()
+
+
+def test_session_isolated(tmp_path):
+    """
+    Sessions can be created using individual options.
+    """
+    options = GitHubHttpOptions(
+        cache_name=str(tmp_path / "cache"),
+        backend="memory",
+        expire_after=60,
+        token="foo",  # noqa: S106
+    )
+    session = GitHubHttpClient.create_session(options)
+    assert session.headers["Authorization"] == "Bearer foo"
+    assert session.settings.expire_after == 60
+    assert session is not GitHubHttpClient.create_session(options)
+
+
+def test_session_expiration_policies(tmp_path):
+    """
+    Search results expire earlier than details about individual items.
+    """
+    session = GitHubHttpClient.create_session(
+        GitHubHttpOptions(cache_name=str(tmp_path / "cache"), backend="memory", revalidate=True)
+    )
+    assert session.settings.always_revalidate is True
+    assert session.settings.urls_expire_after["api.github.com/search/"] == 300
+    assert session.settings.urls_expire_after["api.github.com/repos/*/pulls/"] == 3600
+
+
+def test_pin_response(tmp_path):
+    """
+    Responses about immutable resources are kept for a long time.
+    """
+    session = GitHubHttpClient.create_session(
+        GitHubHttpOptions(cache_name=str(tmp_path / "cache"), backend="memory")
+    )
+    url = "https://api.github.com/repos/acme/foo/pulls/42"
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.request = requests.Request("GET", url).prepare()
+    response.raw = HTTPResponse(body=io.BytesIO(), status=200, request_url=url)
+    response._content = b'{"state": "closed"}'
+    GitHubHttpClient.pin_response(session, response)
+    cached = session.cache.get_response(session.cache.create_key(response.request))
+    assert cached is not None
+    assert cached.expires_delta > 7 * 86400
+
+
+def test_cache_statistics(tmp_path):
+    """
+    Count responses served from the cache, revalidated, or fetched from the network.
+    """
+    session = GitHubHttpClient.create_session(
+        GitHubHttpOptions(cache_name=str(tmp_path / "cache"), backend="memory")
+    )
+    statistics = GitHubCacheStatistics()
+    url = "https://api.github.com/repos/acme/foo/pulls/42"
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.request = requests.Request("GET", url).prepare()
+    response.raw = HTTPResponse(body=io.BytesIO(), status=200, request_url=url)
+    response._content = b"{}"
+
+    # Raw responses are not counted, only their wrapped counterparts.
+    statistics.hook(response)
+    session.cache.save_response(response)
+    statistics.hook(session.cache.get_response(session.cache.create_key(response.request)))
+    assert statistics.counter == {"hit": 1}
+
+    statistics.save(tmp_path / "stats.json")
+    statistics.save(tmp_path / "stats.json")
+    assert GitHubCacheStatistics.load(tmp_path / "stats.json") == {"hit": 2}
+    assert GitHubCacheStatistics.format({"hit": 3, "miss": 1}) == (
+        "hit=3, revalidated=0, miss=1, ratio=75%"
+    )
+
+
+def make_rate_limited_response(status_code: int = 200, **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://api.github.com/search/issues"
+    response.headers.update(headers)
+    response._content = b"{}"
+    return response
+
+
+def test_rate_limit_budget():
+    """
+    The budget per resource is tracked using response headers.
+    """
+    scheduler = GitHubRateLimitScheduler()
+    assert scheduler.remaining("search") is None
+    scheduler.update(
+        make_rate_limited_response(
+            **{
+                "X-RateLimit-Resource": "search",
+                "X-RateLimit-Limit": "30",
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time()) + 3600),
+            }
+        )
+    )
+    assert scheduler.remaining("search") == 0
+    assert scheduler.remaining("core") is None
+    with pytest.raises(GitHubRateLimitExceeded):
+        scheduler.acquire("search")
+
+
+def test_rate_limit_retry(monkeypatch):
+    """
+    Requests rejected by a secondary rate limit are retried.
+    """
+    responses = [
+        make_rate_limited_response(429, **{"Retry-After": "0"}),
+        make_rate_limited_response(200),
+    ]
+    monkeypatch.setattr(HTTPAdapter, "send", lambda *args, **kwargs: responses.pop(0))
+    adapter = GitHubRateLimitAdapter(GitHubRateLimitScheduler(backoff=0))
+    request = requests.Request("GET", "https://api.github.com/search/issues").prepare()
+    assert adapter.send(request).status_code == 200
+    assert responses == []
+    assert GitHubRateLimitScheduler.resource(request.url) == "search"
+
+
+def test_rate_limit_retries_exhausted(monkeypatch):
+    """
+    Requests still rejected by a secondary rate limit after all retries fail.
+    """
+    monkeypatch.setattr(
+        HTTPAdapter,
+        "send",
+        lambda *args, **kwargs: make_rate_limited_response(429, **{"Retry-After": "0"}),
+    )
+    adapter = GitHubRateLimitAdapter(GitHubRateLimitScheduler(retries=2, backoff=0))
+    request = requests.Request("GET", "https://api.github.com/search/issues").prepare()
+    with pytest.raises(GitHubRateLimitExceeded) as ex:
+        adapter.send(request)
+    assert ex.value.response.status_code == 429
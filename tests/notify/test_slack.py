@@ -0,0 +1,186 @@
+import datetime as dt
+import typing as t
+
+from munch import munchify
+
+from pueblo_goof.slack.conversation import SlackConversation
+from rapporto.notify.slack import SlackWeekly
+from rapporto.report.model import DailyItem, DailyReport, ReportOptions, WeeklyReport
+from rapporto.source.github.model import GitHubOptions
+
+
+class FakeConversation:
+    """
+    Record Slack operations, and store messages in memory.
+    """
+
+    find_message_by_metadata = staticmethod(SlackConversation.find_message_by_metadata)
+
+    def __init__(self):
+        self.messages_store: t.List[t.Dict[str, t.Any]] = []
+        self.calls: t.List[str] = []
+
+    def messages(self, oldest=None):
+        return munchify([m for m in self.messages_store if "thread_ts" not in m])
+
+    def replies(self, ts: str):
+        return munchify([m for m in self.messages_store if m.get("thread_ts") == ts])
+
+    def send(self, markdown=None, reply_to=None, event=None, metadata=None):
+        self.calls.append("send")
+        message = {
+            "ts": str(len(self.messages_store) + 1),
+            "text": markdown,
+            "metadata": {"event_type": event, "event_payload": metadata},
+        }
+        if reply_to:
+            message["thread_ts"] = reply_to
+        self.messages_store.append(message)
+        return message
+
+    def update(self, ts, markdown=None, event=None, metadata=None):
+        self.calls.append("update")
+        for message in self.messages_store:
+            if message["ts"] == ts:
+                message["text"] = markdown
+                if event and metadata:
+                    message["metadata"] = {"event_type": event, "event_payload": metadata}
+        return {"ts": ts}
+
+    def get_permalink(self, message_id: str) -> str:
+        return f"https://acme.slack.com/archives/C08EF2NGZGB/p{message_id}"
+
+
+def make_weekly(conversation: FakeConversation) -> SlackWeekly:
+    return SlackWeekly(
+        week="2025W10",
+        github_options=GitHubOptions(organization="acme"),
+        report_options=ReportOptions(),
+        conversation=conversation,  # type: ignore[arg-type]
+    )
+
+
+def test_skip_unchanged():
+    """
+    Messages are only updated when their content changed.
+    """
+    conversation = FakeConversation()
+    weekly = make_weekly(conversation)
+    weekly.seed()
+    item = DailyItem(type="github-attention", day="2025-03-03", markdown="foo")
+    weekly.create_or_update_item(item)
+    assert conversation.calls == ["send", "send", "send"]
+
+    # Another run with the same content does not update any messages,
+    # even though the preamble includes a different timestamp.
+    weekly = make_weekly(conversation)
+    weekly.seed()
+    weekly.create_or_update_item(item)
+    assert conversation.calls == ["send", "send", "send"]
+
+    # Changed content is updated.
+    item.markdown = "bar"
+    weekly.create_or_update_item(item)
+    assert conversation.calls == ["send", "send", "send", "update"]
+    assert conversation.messages_store[-1]["text"] == "bar"
+
+
+def test_preamble_updated_on_change(monkeypatch):
+    """
+    The preamble is only updated when the content of any item changed.
+    """
+    markdown = {"value": "foo"}
+
+    def process(self):
+        daily = DailyReport(
+            day="2025-03-03", github_options=self.github_options, report_options=self.report_options
+        )
+        daily.items.append(
+            DailyItem(type="github-attention", day=daily.day, markdown=markdown["value"])
+        )
+        self.dailies.append(daily)
+
+    monkeypatch.setattr(WeeklyReport, "process", process)
+    conversation = FakeConversation()
+    make_weekly(conversation).refresh()
+    assert conversation.calls == ["send", "send", "send", "update"]
+
+    make_weekly(conversation).refresh()
+    assert conversation.calls == ["send", "send", "send", "update"]
+
+    markdown["value"] = "bar"
+    make_weekly(conversation).refresh()
+    assert conversation.calls == ["send", "send", "send", "update", "update", "update"]
+    assert "**Updated:**" in conversation.messages_store[1]["text"]
+
+
+def test_replies_loaded_once():
+    """
+    Replies to the root message are loaded once, and updated when sending messages.
+    """
+    conversation = FakeConversation()
+    weekly = make_weekly(conversation)
+    weekly.seed()
+    for day in ["2025-03-03", "2025-03-04"]:
+        weekly.create_or_update_item(DailyItem(type="github-attention", day=day, markdown=day))
+
+    loads = []
+    original = conversation.replies
+
+    def replies(ts):
+        loads.append(ts)
+        return original(ts)
+
+    conversation.replies = replies  # type: ignore[method-assign]
+    weekly = make_weekly(conversation)
+    weekly.seed()
+    for day in ["2025-03-03", "2025-03-04", "2025-03-05"]:
+        weekly.create_or_update_item(DailyItem(type="github-attention", day=day, markdown="foo"))
+    assert loads == ["1"]
+    assert set(weekly.replies) == {
+        "preamble_2025W10",
+        "github-attention_2025-03-03",
+        "github-attention_2025-03-04",
+        "github-attention_2025-03-05",
+    }
+    assert conversation.calls.count("send") == 5
+
+
+def test_replies_foreign_event_type():
+    """
+    Replies of foreign event types using the same metadata key are not picked up.
+    """
+    conversation = FakeConversation()
+    weekly = make_weekly(conversation)
+    weekly.seed()
+    key = "github-attention_2025-03-03"
+    conversation.messages_store.append(
+        {
+            "ts": "99",
+            "thread_ts": weekly.root_id,
+            "text": "foreign",
+            "metadata": {"event_type": "foreign_created", "event_payload": {"key": key}},
+        }
+    )
+    weekly.create_or_update_item(
+        DailyItem(type="github-attention", day="2025-03-03", markdown="foo")
+    )
+
+    weekly = make_weekly(conversation)
+    weekly.seed()
+    assert weekly.replies[key]["metadata"]["event_type"] == SlackWeekly.ITEM_EVENT
+    weekly.create_or_update_item(
+        DailyItem(type="github-attention", day="2025-03-03", markdown="bar")
+    )
+    assert conversation.calls == ["send", "send", "send", "update"]
+    assert conversation.messages_store[2]["text"] == "foreign"
+
+
+def test_oldest():
+    """
+    The scan for the root message is bounded by the calendar week.
+    """
+    weekly = make_weekly(FakeConversation())
+    assert weekly.oldest == f"{dt.datetime(2025, 3, 2).timestamp():.6f}"
+    weekly.week = "2999W01"
+    assert weekly.oldest is None
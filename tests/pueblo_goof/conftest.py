@@ -1,6 +1,101 @@
+import collections
+import typing as t
+
 import pytest
+from slack_sdk.errors import SlackApiError
 
 
 @pytest.fixture(autouse=True)
 def reset_environment(monkeypatch):
     monkeypatch.delenv("SLACK_TOKEN", raising=False)
+
+
+Message = t.Dict[str, t.Any]
+
+
+class FakeWebClient:
+    """
+    Respond to Slack API requests from memory, following pagination like `slack_sdk`.
+
+    The channel history is served in pages of `page_size` messages, recording
+    which pages have been fetched. Replies are served one message per page,
+    using `threads`, or the parent message from the history and a reply.
+    Channels and users are served in the given pages. Users missing from them
+    are looked up individually per `guests`. Requests are counted per method.
+    """
+
+    token = "xoxb-foo"  # noqa: S105
+
+    def __init__(
+        self,
+        history: t.Optional[t.List[Message]] = None,
+        threads: t.Optional[t.Dict[str, t.List[Message]]] = None,
+        channels: t.Optional[t.List[t.List[Message]]] = None,
+        users: t.Optional[t.List[t.List[Message]]] = None,
+        guests: t.Optional[t.Dict[str, str]] = None,
+        page_size: int = 2,
+    ):
+        self.history = history or []
+        self.threads = threads or {}
+        self.channels = channels or []
+        self.users = users or []
+        self.guests = guests or {}
+        self.page_size = page_size
+        # Whether the token permits listing private channels.
+        self.private = True
+        # Error code to respond with when listing channels.
+        self.error: t.Optional[str] = None
+        # Threads failing with an unexpected error.
+        self.failing: t.Set[str] = set()
+        self.requests: t.Counter[str] = collections.Counter()
+        self.oldest: t.List[t.Optional[str]] = []
+        self.fetched: t.List[int] = []
+        self.replies: t.List[str] = []
+
+    def conversations_history(self, channel=None, oldest=None, **kwargs):
+        self.requests["conversations_history"] += 1
+        self.oldest.append(oldest)
+        messages = [message for message in self.history if oldest is None or message["ts"] > oldest]
+        for number, offset in enumerate(range(0, max(len(messages), 1), self.page_size)):
+            self.fetched.append(number)
+            yield {"messages": messages[offset : offset + self.page_size]}
+
+    def conversations_replies(self, channel, ts, **kwargs):
+        self.requests["conversations_replies"] += 1
+        self.replies.append(ts)
+        if ts in self.failing:
+            raise RuntimeError("Connection reset")
+        messages = self.threads.get(ts)
+        if messages is None:
+            parent = next((message for message in self.history if message["ts"] == ts), None)
+            messages = []
+            if parent:
+                messages = [parent, {"ts": parent["latest_reply"], "text": "Reply"}]
+        if not messages:
+            yield {"messages": []}
+        for message in messages:
+            yield {"messages": [message]}
+
+    def conversations_info(self, channel):
+        self.requests["conversations_info"] += 1
+        return {"channel": {"name": "incidents", "id": channel}}
+
+    def conversations_list(self, types, **kwargs):
+        self.requests["conversations_list"] += 1
+        if "private_channel" in types and not self.private:
+            raise SlackApiError("Missing scope", {"ok": False, "error": "missing_scope"})
+        if self.error:
+            raise SlackApiError("Failed", {"ok": False, "error": self.error})
+        for page in self.channels:
+            yield {"channels": page}
+
+    def users_list(self, **kwargs):
+        self.requests["users_list"] += 1
+        for page in self.users:
+            yield {"members": page}
+
+    def users_info(self, user):
+        self.requests["users_info"] += 1
+        if user in self.guests:
+            return {"ok": True, "user": {"name": self.guests[user], "id": user}}
+        return {"ok": False, "error": "user_not_found"}
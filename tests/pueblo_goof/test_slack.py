@@ -1,7 +1,11 @@
 import pytest
+from slack_sdk.errors import SlackApiError
 
 from pueblo_goof.cli import cli
+from pueblo_goof.slack.conversation import SlackConversation
+from pueblo_goof.slack.directory import SlackChannelDirectory, SlackUserDirectory
 from pueblo_goof.slack.model import SlackUrl
+from tests.pueblo_goof.conftest import FakeWebClient
 
 
 def test_url_channel():
@@ -53,3 +57,114 @@ def test_cli_send_with_invalid_token(cli_runner, capsys):
         )
     assert ex.match("The request to the Slack API failed")
     assert ex.match("The server responded with: {'ok': False, 'error': 'invalid_auth'}")
+
+
+def test_messages_paginated():
+    """
+    Messages are enumerated across pages, fetched lazily until the first match.
+    """
+    conversation = SlackConversation.__new__(SlackConversation)
+    conversation.channel_id = "C08EF2NGZGB"
+    conversation.webclient = FakeWebClient(  # type: ignore[assignment]
+        history=[
+            {"ts": "3", "text": "foo"},
+            {"ts": "2", "metadata": {"event_payload": {"type": "root", "week": "2025W10"}}},
+            {"ts": "1", "text": "bar"},
+        ],
+        page_size=1,
+    )
+    assert [message.ts for message in conversation.messages()] == ["3", "2", "1"]
+
+    conversation.webclient.fetched.clear()
+    message = conversation.find_message_by_metadata(
+        conversation.messages(), type="root", week="2025W10"
+    )
+    assert message.ts == "2"
+    assert conversation.webclient.fetched == [0, 1]
+
+
+def make_directory_webclient() -> FakeWebClient:
+    return FakeWebClient(
+        channels=[[{"name": "general", "id": "C0000000001"}], []],
+        users=[[{"name": "alice", "id": "U0000000001"}], [{"name": "bob", "id": "U0000000002"}]],
+        guests={"U0000000003": "carol"},
+    )
+
+
+def test_channel_directory(tmp_path):
+    """
+    Channel names are resolved using a persistent cache, refreshed on misses.
+    """
+    webclient = make_directory_webclient()
+    directory = SlackChannelDirectory(webclient, path=tmp_path)  # type: ignore[arg-type]
+    assert directory.resolve("C08EF2NGZGB") == "C08EF2NGZGB"
+    assert sum(webclient.requests.values()) == 0
+    assert directory.resolve("general") == "C0000000001"
+    assert sum(webclient.requests.values()) == 1
+
+    # Another directory instance uses the cache on disk.
+    directory = SlackChannelDirectory(webclient, path=tmp_path)  # type: ignore[arg-type]
+    assert directory.resolve("general") == "C0000000001"
+    assert sum(webclient.requests.values()) == 1
+
+    # Cache misses refresh the directory.
+    webclient.channels[1] = [{"name": "random", "id": "C0000000002"}]
+    assert directory.resolve("random") == "C0000000002"
+    assert sum(webclient.requests.values()) == 2
+    with pytest.raises(KeyError):
+        directory.resolve("unknown")
+
+
+def test_channel_directory_public_only(tmp_path):
+    """
+    Without permission to list private channels, only public channels are enumerated.
+    """
+    webclient = make_directory_webclient()
+    webclient.private = False
+    directory = SlackChannelDirectory(webclient, path=tmp_path)  # type: ignore[arg-type]
+    assert directory.resolve("general") == "C0000000001"
+    assert sum(webclient.requests.values()) == 2
+
+    conversation = SlackConversation.__new__(SlackConversation)
+    conversation.webclient = webclient  # type: ignore[assignment]
+    assert conversation.find_channel("general").id == "C0000000001"
+
+
+def test_decode_channel_api_error():
+    """
+    Slack API errors when resolving channels are reported as lookup errors.
+    """
+    webclient = make_directory_webclient()
+    webclient.token = "xoxb-invalid"  # noqa: S105
+    webclient.error = "invalid_auth"
+    conversation = SlackConversation.__new__(SlackConversation)
+    conversation.webclient = webclient  # type: ignore[assignment]
+    with pytest.raises(KeyError) as ex:
+        conversation.decode_channel("general")
+    assert isinstance(ex.value.__cause__, SlackApiError)
+
+
+def test_user_directory(tmp_path):
+    """
+    User ids are resolved using a bulk-acquired persistent cache, looking up misses individually.
+    """
+    webclient = make_directory_webclient()
+    directory = SlackUserDirectory(webclient, path=tmp_path, max_entries=2)  # type: ignore[arg-type]
+    assert directory.resolve("U0000000001") == "alice"
+    assert directory.resolve("U0000000002") == "bob"
+    assert sum(webclient.requests.values()) == 1
+
+    # Misses are looked up individually, and added to the cache on disk when closing.
+    assert directory.resolve("U0000000003") == "carol"
+    assert directory.resolve("U0000000004") is None
+    assert sum(webclient.requests.values()) == 3
+    assert "carol" not in directory.file.read_text()
+    directory.close()
+    assert "carol" in directory.file.read_text()
+
+    # Another directory instance uses the cache on disk, bounded by size.
+    directory = SlackUserDirectory(webclient, path=tmp_path, max_entries=2)  # type: ignore[arg-type]
+    assert directory.resolve("U0000000003") == "carol"
+    assert directory.resolve("U0000000002") == "bob"
+    assert sum(webclient.requests.values()) == 3
+    assert list(directory.load()) == ["U0000000002", "U0000000003"]
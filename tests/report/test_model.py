@@ -0,0 +1,269 @@
+import datetime as dt
+import os
+import time
+import typing as t
+
+from munch import munchify
+
+from rapporto.report.model import (
+    DailyItem,
+    DailyReport,
+    GitHubHarvest,
+    ReportOptions,
+    SnapshotStore,
+    WeeklyReport,
+)
+from rapporto.source.github.actions import ActionsOutcome, GitHubActionsRequest
+from rapporto.source.github.model import GitHubOptions, GitHubSearch
+
+
+def make_run(
+    day: str, conclusion: str = "failure", started: t.Optional[str] = None
+) -> ActionsOutcome:
+    return ActionsOutcome(
+        id=1,
+        event="schedule",
+        status="completed",
+        conclusion=conclusion,
+        repository=munchify({"full_name": "acme/foo"}),
+        name=f"Tests {day}",
+        url=f"https://github.com/acme/foo/actions/runs/{day}",
+        started=f"{started or day}T10:00:00Z",
+        head_branch="main",
+        created=f"{day}T10:00:00Z",
+    )
+
+
+def make_item(day: str) -> t.Dict[str, t.Any]:
+    return {
+        "title": f"Crash {day}",
+        "state": "open",
+        "labels": [{"name": "bug"}],
+        "repository_url": "https://api.github.com/repos/acme/foo",
+        "html_url": f"https://github.com/acme/foo/issues/{day}",
+        "created_at": f"{day}T08:00:00Z",
+        "updated_at": f"{day}T09:00:00Z",
+    }
+
+
+def test_harvest_partition():
+    partitions = GitHubHarvest.partition(
+        [make_run("2025-03-03"), make_run("2025-03-05"), make_run("2025-03-03")],
+        lambda run: run.started[:10],
+    )
+    assert list(partitions) == ["2025-03-03", "2025-03-05"]
+    assert len(partitions["2025-03-03"]) == 2
+
+
+def test_weekly_single_pass(monkeypatch):
+    """
+    A weekly report fetches information once for the whole week, and partitions it into days.
+    """
+    calls: t.List[str] = []
+
+    def fetch(self, filter):  # noqa: A002
+        calls.append(f"actions {filter.created}")
+        return iter(
+            [
+                make_run("2025-03-03"),
+                make_run("2025-03-05"),
+                make_run("2025-03-06", started="2025-03-11"),
+            ]
+        )
+
+    def issues_and_prs(self):
+        calls.append(f"search {self.query_builder.timeinterval.githubformat()}")
+        return iter([make_item("2025-03-04")])
+
+    monkeypatch.setattr(GitHubActionsRequest, "fetch", fetch)
+    monkeypatch.setattr(GitHubSearch, "issues_and_prs", issues_and_prs)
+
+    report = WeeklyReport(
+        week="2025W10",
+        github_options=GitHubOptions(organization="acme", repositories=["acme/foo"]),
+        report_options=ReportOptions(),
+    )
+    report.process()
+
+    assert calls == ["actions 2025-03-03..2025-03-09", "search 2025-03-03..2025-03-09"]
+    assert [daily.day for daily in report.dailies][:3] == ["2025-03-03", "2025-03-04", "2025-03-05"]
+    markdown = {daily.day: daily.markdown for daily in report.dailies}
+    assert "Tests 2025-03-03" in markdown["2025-03-03"]
+    assert "Tests 2025-03-05" not in markdown["2025-03-03"]
+    # Runs re-run after the end of the week stay on the day they were created.
+    assert "Tests 2025-03-06" in markdown["2025-03-06"]
+    assert "Crash 2025-03-04" in markdown["2025-03-04"]
+    assert "Crash 2025-03-04" not in markdown["2025-03-03"]
+
+
+def test_daily_section_failure(monkeypatch):
+    """
+    A failing section is represented by a placeholder, and does not affect the others.
+    """
+
+    def fetch(self, filter):  # noqa: A002
+        return iter([make_run("2025-03-03")])
+
+    def issues_and_prs(self):
+        raise RuntimeError("Search failed")
+
+    monkeypatch.setattr(GitHubActionsRequest, "fetch", fetch)
+    monkeypatch.setattr(GitHubSearch, "issues_and_prs", issues_and_prs)
+
+    report = DailyReport(
+        day="2025-03-03",
+        github_options=GitHubOptions(organization="acme", repositories=["acme/foo"]),
+        report_options=ReportOptions(),
+    )
+    report.process()
+    assert [item.type for item in report.items] == ["github-actions", "github-attention"]
+    assert report.items[0].complete is True
+    assert report.items[1].complete is False
+    assert report.items[1].markdown == "_Section github-attention unavailable: Search failed_"
+
+    monkeypatch.setattr(GitHubSearch, "issues_and_prs", lambda self: iter([]))
+    report.items.clear()
+    report.process()
+    assert [item.type for item in report.items] == ["github-actions", "github-attention"]
+
+
+def test_weekly_section_failure(monkeypatch, tmp_path):
+    """
+    A source failing to fetch for the whole week is represented by placeholders
+    on each day, does not affect the others, and is not persisted.
+    """
+
+    def fetch(self, filter):  # noqa: A002
+        return iter([make_run("2025-03-03")])
+
+    def issues_and_prs(self):
+        raise RuntimeError("Search failed")
+
+    monkeypatch.setattr(GitHubActionsRequest, "fetch", fetch)
+    monkeypatch.setattr(GitHubSearch, "issues_and_prs", issues_and_prs)
+    monkeypatch.setenv("RAPPORTO_CACHE_DIR", str(tmp_path))
+
+    report = WeeklyReport(
+        week="2025W10",
+        github_options=GitHubOptions(organization="acme", repositories=["acme/foo"]),
+        report_options=ReportOptions(incremental=True),
+    )
+    report.process()
+    assert len(report.dailies) == 7
+    for daily in report.dailies:
+        assert [item.complete for item in daily.items] == [True, False]
+        assert daily.items[1].markdown == "_Section github-attention unavailable: Search failed_"
+    assert "Tests 2025-03-03" in report.dailies[0].markdown
+
+    snapshots = SnapshotStore.for_options(report.github_options)
+    assert snapshots.load("github-actions", "2025-03-03") is not None
+    assert snapshots.load("github-attention", "2025-03-03") is None
+
+
+def test_weekly_incremental(monkeypatch, tmp_path):
+    """
+    In incremental mode, past days are loaded from snapshots, and only today and
+    yesterday are computed.
+    """
+    calls: t.List[str] = []
+
+    def fetch(self, filter):  # noqa: A002
+        calls.append(filter.created)
+        return iter([])
+
+    monkeypatch.setattr(GitHubActionsRequest, "fetch", fetch)
+    monkeypatch.setattr(GitHubSearch, "issues_and_prs", lambda self: iter([]))
+    monkeypatch.setenv("RAPPORTO_CACHE_DIR", str(tmp_path))
+
+    today = dt.date.today()
+    week = today.strftime("%GW%V")
+    options = dict(
+        week=week,
+        github_options=GitHubOptions(organization="acme", repositories=["acme/foo"]),
+        report_options=ReportOptions(incremental=True),
+    )
+
+    WeeklyReport(**options).process()
+    report = WeeklyReport(**options)
+    report.process()
+
+    monday = today - dt.timedelta(days=today.weekday())
+    yesterday = max(monday, today - dt.timedelta(days=1))
+    assert calls[0] == f"{monday.isoformat()}..{today.isoformat()}"
+    assert calls[1] == f"{yesterday.isoformat()}..{today.isoformat()}"
+    assert [daily.day for daily in report.dailies][-1] == today.isoformat()
+    assert all(len(daily.items) == 2 for daily in report.dailies)
+
+    # Refreshing computes all days again.
+    WeeklyReport(
+        week=week,
+        github_options=options["github_options"],
+        report_options=ReportOptions(incremental=True, refresh=True),
+    ).process()
+    assert calls[2] == f"{monday.isoformat()}..{today.isoformat()}"
+
+
+def test_snapshot_store(tmp_path):
+    store = SnapshotStore(fingerprint="foo", path=tmp_path)
+    today = dt.date.today()
+    yesterday = (today - dt.timedelta(days=1)).isoformat()
+    past = (today - dt.timedelta(days=2)).isoformat()
+    store.save(DailyItem(type="github-actions", day=yesterday, markdown="foo"))
+    store.save(DailyItem(type="github-actions", day=past, markdown="bar"))
+    assert store.load("github-actions", yesterday) is None
+    assert store.load("github-actions", past) == DailyItem(
+        type="github-actions", day=past, markdown="bar"
+    )
+
+    # Placeholders of failed sections are not persisted.
+    store.save(DailyItem(type="github-attention", day=past, markdown="baz", complete=False))
+    assert store.load("github-attention", past) is None
+
+
+def test_snapshot_store_expiry(tmp_path):
+    """
+    Snapshots expire after their time to live, and are ignored when refreshing.
+    """
+    past = (dt.date.today() - dt.timedelta(days=3)).isoformat()
+    item = DailyItem(type="github-attention", day=past, markdown="foo")
+    store = SnapshotStore(fingerprint="foo", path=tmp_path, ttl=3600)
+    store.save(item)
+    assert store.load("github-attention", past) == item
+    assert (
+        SnapshotStore(fingerprint="foo", path=tmp_path, refresh=True).load("github-attention", past)
+        is None
+    )
+
+    stale = time.time() - 7200
+    os.utime(store.file("github-attention", past), (stale, stale))
+    assert store.load("github-attention", past) is None
+    assert (
+        SnapshotStore(fingerprint="foo", path=tmp_path, ttl=None).load("github-attention", past)
+        == item
+    )
+
+
+def test_daily_incomplete_not_persisted(monkeypatch, tmp_path):
+    """
+    Sections with incomplete information, e.g. because of an exhausted rate limit, are
+    not persisted.
+    """
+
+    def issues_and_prs(self):
+        self.incomplete.append("Search results incomplete")
+        return iter([make_item("2025-03-03")])
+
+    monkeypatch.setattr(GitHubActionsRequest, "fetch", lambda self, filter: iter([]))  # noqa: A006
+    monkeypatch.setattr(GitHubSearch, "issues_and_prs", issues_and_prs)
+
+    store = SnapshotStore(fingerprint="foo", path=tmp_path, ttl=None)
+    report = DailyReport(
+        day="2025-03-03",
+        github_options=GitHubOptions(organization="acme", repositories=["acme/foo"]),
+        report_options=ReportOptions(),
+    )
+    report.process(snapshots=store)
+    assert [item.complete for item in report.items] == [True, False]
+    assert "> - Search results incomplete" in report.items[1].markdown
+    assert store.load("github-actions", "2025-03-03") is not None
+    assert store.load("github-attention", "2025-03-03") is None
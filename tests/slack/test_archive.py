@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from pueblo_goof.slack.directory import SlackUserDirectory
+from rapporto.source.slack.archive import SlackChannelArchiver
+from rapporto.source.slack.core import SlackThreadExporter
+from tests.pueblo_goof.conftest import FakeWebClient
+
+
+def make_webclient() -> FakeWebClient:
+    """
+    A paginated channel history, with two threads.
+    """
+    return FakeWebClient(
+        history=[
+            {
+                "ts": "1738873900.000200",
+                "text": "Deployment\nDetails",
+                "reply_count": 1,
+                "latest_reply": "1738873950.000000",
+            },
+            {"ts": "1738873850.000100", "text": "Hello"},
+            {
+                "ts": "1738873800.000100",
+                "text": "Outage",
+                "reply_count": 2,
+                "latest_reply": "1738873860.000000",
+            },
+        ]
+    )
+
+
+def make_exporter(webclient: FakeWebClient, tmp_path) -> SlackThreadExporter:
+    exporter = SlackThreadExporter("xoxb-foo")
+    exporter.client = webclient  # type: ignore[assignment]
+    exporter.users = SlackUserDirectory(webclient, path=tmp_path)  # type: ignore[arg-type]
+    return exporter
+
+
+def test_archive_incremental(tmp_path):
+    """
+    Only new or changed threads are exported, starting from the high-water mark.
+    """
+    webclient = make_webclient()
+    exporter = make_exporter(webclient, tmp_path)
+
+    archiver = SlackChannelArchiver(
+        exporter, channel="C08EF2NGZGB", output_dir=str(tmp_path / "archive"), lookback_days=0
+    )
+    assert archiver.archive() == {"inspected": 3, "exported": 2, "failed": 0}
+    assert sorted(webclient.replies) == ["1738873800.000100", "1738873900.000200"]
+    index = (tmp_path / "archive" / "index.md").read_text().splitlines()
+    assert index[0] == "# Archive of channel C08EF2NGZGB"
+    assert "[Deployment](1738873900.000200.md)" in index[2]
+    assert "[Outage](1738873800.000100.md)" in index[3]
+
+    # Subsequent runs only inspect messages since the high-water mark,
+    # and only export threads with new replies.
+    webclient.history.insert(
+        0,
+        {
+            "ts": "1738874000.000100",
+            "text": "Later",
+            "reply_count": 1,
+            "latest_reply": "1738874010.000000",
+        },
+    )
+    webclient.history[1]["latest_reply"] = "1738874020.000000"
+    webclient.replies.clear()
+    archiver = SlackChannelArchiver(
+        exporter, channel="C08EF2NGZGB", output_dir=str(tmp_path / "archive"), lookback_days=1
+    )
+    assert archiver.archive() == {"inspected": 4, "exported": 2, "failed": 0}
+    assert webclient.oldest[-1] == f"{1738873900.0002 - 86400:.6f}"
+    assert sorted(webclient.replies) == ["1738873900.000200", "1738874000.000100"]
+
+    state = json.loads((tmp_path / "archive" / "archive.json").read_text())
+    assert state["latest_ts"] == "1738874000.000100"
+    assert len(state["threads"]) == 3
+
+
+def test_archive_retry_failed(tmp_path):
+    """
+    Threads which failed to export are retried, without rewinding the high-water mark.
+    """
+    webclient = make_webclient()
+    webclient.failing.add("1738873800.000100")
+    exporter = make_exporter(webclient, tmp_path)
+    output_dir = str(tmp_path / "archive")
+
+    archiver = SlackChannelArchiver(exporter, channel="C08EF2NGZGB", output_dir=output_dir)
+    assert archiver.archive() == {"inspected": 3, "exported": 1, "failed": 1}
+    state = json.loads((tmp_path / "archive" / "archive.json").read_text())
+    assert state["latest_ts"] == "1738873900.000200"
+    assert list(state["failed"]) == ["1738873800.000100"]
+
+    # The failed thread is retried, even when outside of the lookback period.
+    webclient.failing.clear()
+    webclient.replies.clear()
+    archiver = SlackChannelArchiver(
+        exporter, channel="C08EF2NGZGB", output_dir=output_dir, lookback_days=0
+    )
+    assert archiver.archive() == {"inspected": 0, "exported": 1, "failed": 0}
+    assert webclient.replies == ["1738873800.000100"]
+    state = json.loads((tmp_path / "archive" / "archive.json").read_text())
+    assert state["failed"] == {}
+    assert state["threads"]["1738873800.000100"]["title"] == "Outage"
+
+
+def test_archive_channel_mismatch(tmp_path):
+    """
+    The archive of another channel is not used.
+    """
+    webclient = make_webclient()
+    exporter = make_exporter(webclient, tmp_path)
+    output_dir = str(tmp_path / "archive")
+    SlackChannelArchiver(exporter, channel="C08EF2NGZGB", output_dir=output_dir).archive()
+    with pytest.raises(ValueError) as ex:
+        SlackChannelArchiver(exporter, channel="C0000000001", output_dir=output_dir)
+    assert ex.match("belongs to channel C08EF2NGZGB, not to channel C0000000001")
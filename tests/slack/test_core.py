@@ -0,0 +1,217 @@
+import io
+import typing as t
+
+from pueblo_goof.slack.directory import SlackUserDirectory
+from rapporto.source.slack.cli import read_urls
+from rapporto.source.slack.core import SlackAttachment, SlackFileDownloader, SlackThreadExporter
+from tests.conftest import FakeResponse
+from tests.pueblo_goof.conftest import FakeWebClient
+
+
+class FakeSession:
+    """
+    Serve files from memory, honoring range requests, and record requests.
+    """
+
+    def __init__(self, files):
+        self.files = files
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        headers = headers or {}
+        self.requests.append((url, headers.get("Range")))
+        if url not in self.files:
+            return FakeResponse(status_code=404)
+        content = self.files[url]
+        if "Range" in headers:
+            offset = int(headers["Range"].removeprefix("bytes=").rstrip("-"))
+            return FakeResponse(status_code=206, content=content[offset:])
+        return FakeResponse(content=content)
+
+
+def test_download_concurrent(tmp_path):
+    """
+    Files are downloaded concurrently, and failures are reported individually.
+    """
+    session = FakeSession({"https://files.slack.com/a.png": b"a" * 10})
+    downloader = SlackFileDownloader("xoxb-foo", concurrency=2, chunk_size=3)
+    downloader.session = session  # type: ignore[assignment]
+    good = SlackAttachment(url="https://files.slack.com/a.png", path=str(tmp_path / "a.png"))
+    bad = SlackAttachment(url="https://files.slack.com/b.png", path=str(tmp_path / "b.png"))
+    assert downloader.download([good, bad]) == [good]
+    assert downloader.download([good, bad]) == [good]
+    assert (tmp_path / "a.png").read_bytes() == b"a" * 10
+    assert not (tmp_path / "b.png").exists()
+
+    # All downloads share the same pool of workers.
+    assert downloader.executor is not None
+    assert downloader.executor._max_workers == 2
+    downloader.close()
+    assert downloader.executor is None
+
+
+def test_download_skip_and_resume(tmp_path):
+    """
+    Files already present are skipped, and partial downloads are resumed.
+    """
+    url = "https://files.slack.com/log.txt"
+    content = b"0123456789"
+    session = FakeSession({url: content[:4]})
+    downloader = SlackFileDownloader("xoxb-foo")
+    downloader.session = session  # type: ignore[assignment]
+    attachment = SlackAttachment(
+        url=url, path=str(tmp_path / "log.txt"), size=len(content), file_id="F01", created=1
+    )
+
+    # An interrupted download is kept as partial file, and resumed.
+    assert downloader.fetch(attachment) is False
+    assert (tmp_path / "log.txt.part").read_bytes() == content[:4]
+    session.files[url] = content
+    assert downloader.fetch(attachment) is True
+    assert session.requests == [(url, None), (url, "bytes=4-")]
+    assert (tmp_path / "log.txt").read_bytes() == content
+    assert not (tmp_path / "log.txt.part").exists()
+
+    assert downloader.fetch(attachment) is True
+    assert len(session.requests) == 2
+
+
+def test_download_replaced(tmp_path):
+    """
+    Files of the same size are downloaded again, when the Slack file changed.
+    """
+    url = "https://files.slack.com/log.txt"
+    session = FakeSession({url: b"0123456789"})
+    downloader = SlackFileDownloader("xoxb-foo")
+    downloader.session = session  # type: ignore[assignment]
+    path = str(tmp_path / "log.txt")
+    assert downloader.fetch(SlackAttachment(url=url, path=path, size=10, file_id="F01")) is True
+
+    session.files[url] = b"abcdefghij"
+    assert downloader.fetch(SlackAttachment(url=url, path=path, size=10, file_id="F02")) is True
+    assert session.requests == [(url, None), (url, None)]
+    assert (tmp_path / "log.txt").read_bytes() == b"abcdefghij"
+
+
+def test_attachment_markdown():
+    image = SlackAttachment(url="", path="attachments/foo.png", mimetype="image/png")
+    assert image.markdown == "![foo.png](attachments/foo.png)"
+    other = SlackAttachment(url="", path="attachments/foo.log", mimetype="text/plain")
+    assert other.markdown == "**Attachment:** [Download foo.log](attachments/foo.log)"
+
+
+def make_exporter(webclient: FakeWebClient, tmp_path) -> SlackThreadExporter:
+    exporter = SlackThreadExporter("xoxb-foo")
+    exporter.client = webclient  # type: ignore[assignment]
+    exporter.users = SlackUserDirectory(webclient, path=tmp_path)  # type: ignore[arg-type]
+    return exporter
+
+
+def make_thread(ts: str) -> t.List[t.Dict[str, t.Any]]:
+    return [{"ts": ts, "user": "U0000000001", "text": "Outage"}, {"ts": ts, "text": "Resolved"}]
+
+
+def test_export_threads(tmp_path):
+    """
+    Threads are exported concurrently, sharing channel names, and following pagination cursors.
+    """
+    webclient = FakeWebClient(
+        threads={ts: make_thread(ts) for ts in ["1738873838.427919", "1738873838.427920"]},
+        users=[[{"name": "alice", "id": "U0000000001"}]],
+    )
+    exporter = make_exporter(webclient, tmp_path)
+    summary = exporter.export_threads(
+        [
+            "https://acme.slack.com/archives/C08EF2NGZGB/p1738873838427919",
+            "https://acme.slack.com/archives/C08EF2NGZGB/p1738873838427920",
+            "https://acme.slack.com/foo",
+        ],
+        output_dir=tmp_path / "export",
+    )
+    results = summary.results
+    assert [result.success for result in results] == [True, True, False]
+    assert [result.messages for result in results] == [2, 2, 0]
+    assert summary.failed == [results[2]]
+    assert webclient.requests["conversations_info"] == 1
+    assert webclient.requests["conversations_replies"] == 2
+    markdown = open(results[0].path).read()  # type: ignore[arg-type]
+    assert "### @alice" in markdown
+    assert "Resolved" in markdown
+
+
+def test_read_urls(monkeypatch):
+    """
+    URLs are collected from arguments, files, and stdin.
+    """
+    monkeypatch.setattr("sys.stdin", io.StringIO("https://b\n\n# comment\nhttps://c\n"))
+    file = io.StringIO("https://a\nhttps://d\n")
+    assert read_urls(["https://a", "-"], file) == [
+        "https://a",
+        "https://b",
+        "https://c",
+        "https://d",
+    ]
+
+
+def test_export_threads_unexpected_error(tmp_path):
+    """
+    Unexpected errors and empty threads are recorded, without aborting other exports.
+    """
+
+    webclient = FakeWebClient(threads={"1738873838.427921": make_thread("1738873838.427921")})
+    webclient.failing.add("1738873838.427919")
+    exporter = make_exporter(webclient, tmp_path)
+    summary = exporter.export_threads(
+        [
+            "https://acme.slack.com/archives/C08EF2NGZGB/p1738873838427919",
+            "https://acme.slack.com/archives/C08EF2NGZGB/p1738873838427920",
+            "https://acme.slack.com/archives/C08EF2NGZGB/p1738873838427921",
+        ],
+        output_dir=tmp_path / "export",
+    )
+    assert [result.error for result in summary.results] == [
+        "Error exporting thread: Connection reset",
+        "Error fetching thread: No messages found",
+        None,
+    ]
+    assert len(summary.failed) == 2
+
+
+def test_export_threads_attachments(tmp_path):
+    """
+    Attachments of threads sharing the attachments directory do not collide.
+    """
+
+    def make_screenshot(ts: str) -> t.List[t.Dict[str, t.Any]]:
+        file_id = f"F{ts.replace('.', '')}"
+        file = {
+            "id": file_id,
+            "name": "image.png",
+            "mimetype": "image/png",
+            "url_private_download": f"https://files.slack.com/{file_id}",
+        }
+        return [{"ts": ts, "text": "Screenshot", "files": [file]}]
+
+    webclient = FakeWebClient(
+        threads={ts: make_screenshot(ts) for ts in ["1738873838.000001", "1738873850.000001"]}
+    )
+    exporter = make_exporter(webclient, tmp_path)
+    exporter.downloader.session = FakeSession(  # type: ignore[assignment]
+        {
+            "https://files.slack.com/F1738873838000001": b"a",
+            "https://files.slack.com/F1738873850000001": b"b",
+        }
+    )
+    summary = exporter.export_threads(
+        [
+            "https://acme.slack.com/archives/C08EF2NGZGB/p1738873838000001",
+            "https://acme.slack.com/archives/C08EF2NGZGB/p1738873850000001",
+        ],
+        output_dir=tmp_path / "export",
+    )
+    assert [result.files for result in summary.results] == [1, 1]
+    attachments = tmp_path / "export" / "attachments"
+    assert (attachments / "F1738873838000001_image.png").read_bytes() == b"a"
+    assert (attachments / "F1738873850000001_image.png").read_bytes() == b"b"
+    markdown = open(summary.results[1].path).read()  # type: ignore[arg-type]
+    assert "(attachments/F1738873850000001_image.png)" in markdown
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from rapporto.cli import cli
 
 
@@ -11,3 +14,60 @@ def test_cli_version(cli_runner):
         catch_exceptions=False,
     )
     assert result.exit_code == 0
+
+
+def test_cli_startup_lazy():
+    """
+    Importing the CLI entrypoint must not import any of the subsystems.
+    """
+    heavy_modules = [
+        "aika",
+        "dateparser",
+        "markdown_to_mrkdwn",
+        "opsgenie_sdk",
+        "requests_cache",
+        "slack_sdk",
+        "tabulate",
+    ]
+    program = (
+        "import sys; import rapporto.cli; "
+        f"print(','.join(sorted(name for name in {heavy_modules!r} if name in sys.modules)))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", program], text=True)  # noqa: S603
+    assert output.strip() == ""
+
+
+def test_cli_lazy_alias(cli_runner):
+    """
+    CLI test: Invoke lazily loaded subcommand per alias, `rapporto gh --help`.
+    """
+    result = cli_runner.invoke(
+        cli,
+        args="gh --help",
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert "Harvest information from GitHub." in result.output
+
+
+def test_cli_github_http_options(cli_runner):
+    """
+    CLI test: Options for HTTP sessions to the GitHub API are applied on `rapporto gh`.
+    """
+    from rapporto.source.github.util import GitHubHttpClient, GitHubHttpOptions
+
+    try:
+        result = cli_runner.invoke(
+            cli,
+            args="gh --github-token=foo --cache-expire=60 --cache-revalidate "
+            "--http-pool-size=4 actions --help",
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+        assert GitHubHttpClient.options.token == "foo"  # noqa: S105
+        assert GitHubHttpClient.options.expire_after == 60
+        assert GitHubHttpClient.options.revalidate is True
+        assert GitHubHttpClient.options.pool_maxsize == 4
+    finally:
+        GitHubHttpClient.options = GitHubHttpOptions()
+        GitHubHttpClient.reset()